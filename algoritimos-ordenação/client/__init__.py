@@ -0,0 +1,18 @@
+# client/__init__.py
+from client.sdk import (
+    ClusterClient,
+    DeliveryReceipt,
+    GrantReceipt,
+    ClientError,
+    DeliveryTimeout,
+    ResourceRequestRejected,
+)
+
+__all__ = [
+    "ClusterClient",
+    "DeliveryReceipt",
+    "GrantReceipt",
+    "ClientError",
+    "DeliveryTimeout",
+    "ResourceRequestRejected",
+]
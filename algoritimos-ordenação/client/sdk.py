@@ -0,0 +1,350 @@
+# client/sdk.py
+import asyncio
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+# --- Resultados entregues aos clientes ---
+
+class DeliveryReceipt(BaseModel):
+    """Confirma que uma mensagem foi entregue em ordem total no processo de origem."""
+    message_id: str
+    content: str
+    process_id: Optional[int]
+
+class GrantReceipt(BaseModel):
+    """Confirma que um processo obteve acesso à região crítica (Q2)."""
+    request_id: str
+    process_id: Optional[int]
+
+# --- Erros ---
+
+class ClientError(Exception):
+    """Erro genérico do cliente do cluster."""
+
+class DeliveryTimeout(ClientError):
+    """A entrega (ou a decisão sobre o recurso) não foi confirmada dentro do prazo."""
+
+class ResourceRequestRejected(ClientError):
+    """O processo ignorou o pedido porque já estava usando ou aguardando o recurso."""
+
+
+class _Endpoint:
+    """Estado do cliente para um processo do cluster."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.process_id: Optional[int] = None
+        self.in_flight = 0            # Futuros ainda não resolvidos roteados para este processo
+        self.grants_in_flight = 0     # Pedidos de recurso ainda não decididos
+        self.down_until = 0.0         # Instante até o qual o processo é considerado indisponível
+        self.pending: List[Tuple[str, asyncio.Future]] = []  # Mensagens aguardando o próximo lote
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def is_available(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+
+class ClusterClient:
+    """Cliente assíncrono para os processos do cluster.
+
+    Mantém um pool de conexões com todos os processos, agrupa chamadas a `/send` em lotes
+    (`/send-batch`) enviados em pipeline e devolve futuros que só são resolvidos quando a
+    mensagem é entregue em ordem total (Q1) ou quando o acesso à região crítica é concedido (Q2).
+
+    Exemplo (com os port-forwards usados pelos scripts de `testes/`):
+
+        async with ClusterClient(["http://127.0.0.1:8080", "http://127.0.0.1:8081"]) as client:
+            futures = [client.send(f"mensagem {i}") for i in range(100)]
+            receipts = await asyncio.gather(*futures)
+            grant = await client.request_resource()
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        max_batch_size: int = 32,
+        batch_interval: float = 0.005,
+        max_in_flight_batches: int = 4,
+        delivery_timeout: float = 60.0,
+        request_timeout: float = 5.0,
+        poll_timeout: float = 10.0,
+        max_connections: int = 32,
+        down_cooldown: float = 2.0,
+    ):
+        if not endpoints:
+            raise ValueError("É necessário informar ao menos um endpoint.")
+        self._endpoints = [_Endpoint(url) for url in endpoints]
+        self._max_batch_size = max_batch_size
+        self._batch_interval = batch_interval
+        self._delivery_timeout = delivery_timeout
+        self._request_timeout = request_timeout
+        self._poll_timeout = poll_timeout
+        self._down_cooldown = down_cooldown
+        self._max_in_flight_batches = max_in_flight_batches
+        self._batch_slots: Optional[asyncio.Semaphore] = None
+        self._round_robin = itertools.count()
+        self._leader_id: Optional[int] = None
+        self._tasks: set = set()
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=request_timeout,
+        )
+
+    async def __aenter__(self) -> "ClusterClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """Descobre o ID de cada processo e o líder atual (usados por `route="leader"` e nos recibos)."""
+        await asyncio.gather(*(self._discover(endpoint) for endpoint in self._endpoints))
+        await self.refresh_leader()
+
+    async def close(self):
+        """Envia os lotes pendentes, aguarda as confirmações em andamento e fecha o pool."""
+        for endpoint in self._endpoints:
+            self._flush(endpoint)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._http.aclose()
+
+    # --- Q1: Multicast com ordenação total ---
+
+    def send(self, content: str, route: str = "balanced") -> "asyncio.Future[DeliveryReceipt]":
+        """Agenda o multicast de `content` e devolve um futuro resolvido na entrega em ordem total.
+
+        `route` pode ser "balanced" (processo menos ocupado) ou "leader" (líder atual).
+        Deve ser chamado com o event loop em execução.
+        """
+        future = asyncio.get_running_loop().create_future()
+        endpoint = self._choose(route)
+        endpoint.in_flight += 1
+        future.add_done_callback(lambda _: self._release(endpoint))
+        endpoint.pending.append((content, future))
+
+        if len(endpoint.pending) >= self._max_batch_size:
+            self._flush(endpoint)
+        elif endpoint.flush_handle is None:
+            endpoint.flush_handle = asyncio.get_running_loop().call_later(
+                self._batch_interval, self._flush, endpoint
+            )
+        return future
+
+    def _flush(self, endpoint: _Endpoint):
+        """Retira o lote pendente de um processo e o envia em background."""
+        if endpoint.flush_handle is not None:
+            endpoint.flush_handle.cancel()
+            endpoint.flush_handle = None
+        if not endpoint.pending:
+            return
+        batch, endpoint.pending = endpoint.pending, []
+        self._spawn(self._send_batch(endpoint, batch))
+
+    def _slots(self) -> asyncio.Semaphore:
+        """Limite de lotes em pipeline. Criado no primeiro uso para ficar associado ao event loop (Python 3.9)."""
+        if self._batch_slots is None:
+            self._batch_slots = asyncio.Semaphore(self._max_in_flight_batches)
+        return self._batch_slots
+
+    async def _send_batch(self, endpoint: _Endpoint, batch: List[Tuple[str, asyncio.Future]]):
+        """Envia um lote para `/send-batch` e aguarda a entrega de cada mensagem."""
+        contents = [content for content, _ in batch]
+        try:
+            async with self._slots():
+                target, data = await self._post_with_failover(endpoint, "/send-batch", json={"contents": contents})
+
+            futures: Dict[str, Tuple[str, asyncio.Future]] = {
+                message_id: (content, future) for message_id, (content, future) in zip(data["message_ids"], batch)
+            }
+            await self._wait_deliveries(target, futures)
+        except Exception as e:
+            # Nenhum futuro do lote pode ficar pendente: o chamador estaria esperando para sempre
+            error = e if isinstance(e, ClientError) else ClientError(f"Falha no envio do lote para {endpoint.url}: {e!r}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def _wait_deliveries(self, endpoint: _Endpoint, futures: Dict[str, Tuple[str, asyncio.Future]]):
+        """Faz long-polling em `/wait-delivery` até que todas as mensagens do lote sejam entregues."""
+        deadline = time.monotonic() + self._delivery_timeout
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            poll_timeout = min(self._poll_timeout, remaining)
+            try:
+                response = await self._http.post(
+                    f"{endpoint.url}/wait-delivery",
+                    params={"timeout": poll_timeout},
+                    json={"message_ids": list(futures)},
+                    timeout=poll_timeout + self._request_timeout,
+                )
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                self._fail_all(futures, ClientError(f"Falha ao aguardar entregas em {endpoint.url}: {e}"))
+                return
+
+            for message_id in response.json()["delivered"]:
+                content, future = futures.pop(message_id)
+                if not future.done():
+                    future.set_result(DeliveryReceipt(
+                        message_id=message_id, content=content, process_id=endpoint.process_id
+                    ))
+
+        self._fail_all(futures, DeliveryTimeout(f"Entrega não confirmada em {self._delivery_timeout}s."))
+
+    # --- Q2: Exclusão mútua ---
+
+    def request_resource(self, route: str = "balanced") -> "asyncio.Future[GrantReceipt]":
+        """Pede acesso à região crítica e devolve um futuro resolvido quando o acesso é concedido.
+
+        Com `route="balanced"`, prefere processos sem pedido de recurso em andamento,
+        já que cada processo atende a um pedido por vez.
+        """
+        future = asyncio.get_running_loop().create_future()
+        endpoint = self._choose(route, prefer_idle_grants=True)
+        endpoint.in_flight += 1
+        endpoint.grants_in_flight += 1
+        future.add_done_callback(lambda _: self._release(endpoint, grant=True))
+        self._spawn(self._request_resource(endpoint, future))
+        return future
+
+    async def _request_resource(self, endpoint: _Endpoint, future: asyncio.Future):
+        try:
+            endpoint, data = await self._post_with_failover(endpoint, "/request-resource")
+            request_id = data["request_id"]
+            deadline = time.monotonic() + self._delivery_timeout
+            status = "PENDING"
+            while status == "PENDING" and time.monotonic() < deadline:
+                poll_timeout = min(self._poll_timeout, max(deadline - time.monotonic(), 0.0))
+                response = await self._http.get(
+                    f"{endpoint.url}/resource-status/{request_id}",
+                    params={"timeout": poll_timeout},
+                    timeout=poll_timeout + self._request_timeout,
+                )
+                response.raise_for_status()
+                status = response.json()["status"]
+        except ClientError as e:
+            error: ClientError = e
+        except Exception as e:
+            # Inclui respostas inesperadas (JSON inválido, campos ausentes): o futuro não pode ficar pendente
+            error = ClientError(f"Falha no pedido de recurso em {endpoint.url}: {e!r}")
+        else:
+            if status == "GRANTED":
+                if not future.done():
+                    future.set_result(GrantReceipt(request_id=request_id, process_id=endpoint.process_id))
+                return
+            if status == "REJECTED":
+                error = ResourceRequestRejected(f"P{endpoint.process_id} já está usando ou aguardando o recurso.")
+            else:
+                error = DeliveryTimeout(f"Acesso ao recurso não concedido em {self._delivery_timeout}s.")
+
+        if not future.done():
+            future.set_exception(error)
+
+    # --- Q3: Líder ---
+
+    async def refresh_leader(self) -> Optional[int]:
+        """Consulta o líder conhecido pelos processos e atualiza o cache do cliente.
+
+        Os processos podem discordar durante uma eleição; vale o líder do term mais recente.
+        """
+        best_term = -1
+        for endpoint in self._candidates():
+            try:
+                response = await self._http.get(f"{endpoint.url}/leader")
+                response.raise_for_status()
+            except httpx.HTTPError:
+                self._mark_down(endpoint)
+                continue
+            data = response.json()
+            if data["leader_id"] is not None and data.get("leader_term", 0) > best_term:
+                best_term = data.get("leader_term", 0)
+                self._leader_id = data["leader_id"]
+        return self._leader_id
+
+    @property
+    def leader_id(self) -> Optional[int]:
+        return self._leader_id
+
+    # --- Balanceamento e falhas ---
+
+    def _candidates(self) -> List[_Endpoint]:
+        available = [e for e in self._endpoints if e.is_available()]
+        return available or list(self._endpoints)
+
+    def _choose(self, route: str, prefer_idle_grants: bool = False, exclude: Optional[_Endpoint] = None) -> _Endpoint:
+        """Escolhe o processo de destino: o líder ou o menos ocupado (empates em round-robin)."""
+        candidates = [e for e in self._candidates() if e is not exclude] or self._candidates()
+
+        if route == "leader" and self._leader_id is not None:
+            for endpoint in candidates:
+                if endpoint.process_id == self._leader_id:
+                    return endpoint
+        elif route not in ("balanced", "leader"):
+            raise ValueError(f"Rota desconhecida: {route}")
+
+        if prefer_idle_grants:
+            idle = [e for e in candidates if e.grants_in_flight == 0]
+            candidates = idle or candidates
+
+        offset = next(self._round_robin)
+        rotated = candidates[offset % len(candidates):] + candidates[:offset % len(candidates)]
+        return min(rotated, key=lambda e: e.in_flight)
+
+    async def _post_with_failover(self, endpoint: _Endpoint, path: str, json=None) -> Tuple[_Endpoint, dict]:
+        """Envia um POST e, se a conexão falhar, tenta outro processo disponível.
+
+        Só há nova tentativa quando a conexão não chegou a ser estabelecida, para
+        não multiplicar mensagens que o processo pode já ter recebido.
+        """
+        tried: List[_Endpoint] = []
+        while True:
+            try:
+                response = await self._http.post(f"{endpoint.url}{path}", json=json)
+                response.raise_for_status()
+                return endpoint, response.json()
+            except httpx.ConnectError as e:
+                self._mark_down(endpoint)
+                tried.append(endpoint)
+                untried = [c for c in self._candidates() if c not in tried]
+                if not untried:
+                    raise ClientError(f"Nenhum processo disponível para {path}: {e}") from e
+                endpoint = min(untried, key=lambda e: e.in_flight)
+            except httpx.HTTPError as e:
+                raise ClientError(f"Falha em {endpoint.url}{path}: {e}") from e
+
+    def _mark_down(self, endpoint: _Endpoint):
+        endpoint.down_until = time.monotonic() + self._down_cooldown
+
+    def _release(self, endpoint: _Endpoint, grant: bool = False):
+        endpoint.in_flight -= 1
+        if grant:
+            endpoint.grants_in_flight -= 1
+
+    async def _discover(self, endpoint: _Endpoint):
+        try:
+            response = await self._http.get(f"{endpoint.url}/")
+            response.raise_for_status()
+            endpoint.process_id = response.json()["process_id"]
+        except httpx.HTTPError:
+            self._mark_down(endpoint)
+
+    def _spawn(self, coroutine):
+        """Mantém referência forte às tarefas em background (mesmo padrão de src/main.py)."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _fail_all(futures: Dict[str, Tuple[str, asyncio.Future]], error: ClientError):
+        for _, future in futures.values():
+            if not future.done():
+                future.set_exception(error)
+        futures.clear()
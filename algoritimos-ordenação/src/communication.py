@@ -1,11 +1,35 @@
 # src/communication.py
 import httpx
 import asyncio
+from typing import List, Optional
 from src.config import PEERS, PEER_PORT, PROCESS_ID, TOTAL_PROCESSES
 from src.logger import logger
 from src.models import Message, Ack
-from src.process_logic import LOGICAL_CLOCK
-from src.models import SCRequest
+from src.process_logic import LOGICAL_CLOCK, ELECTION_MESSAGES_SENT
+from src.models import SCRequest, SnapshotMarker, LocalSnapshot
+from src.snapshot import tag_outgoing_message, untag_outgoing_message
+
+
+def peer_id_from_name(peer_name: str) -> int:
+    """Extrai o ID do peer do FQDN (algoritmos-coord-{id}.algoritmos-coord-service)."""
+    return int(peer_name.split('.')[0].split('-')[-1])
+
+def snapshot_params(peer_id: int, params: Optional[dict] = None, count: int = 1) -> dict:
+    """Anexa a época de snapshot aos parâmetros de uma mensagem enviada para `peer_id`."""
+    return {**(params or {}), "snapshot_epoch": tag_outgoing_message(peer_id, count)}
+
+async def post_to_peer(client: httpx.AsyncClient, url: str, peer_id: int, params: Optional[dict] = None,
+                       count: int = 1, **kwargs) -> httpx.Response:
+    """Envia `count` mensagens para `peer_id` com a época de snapshot anexada.
+
+    Se a conexão falhar, as mensagens certamente não foram entregues e saem da contagem do snapshot.
+    """
+    params = snapshot_params(peer_id, params, count)
+    try:
+        return await client.post(url, params=params, **kwargs)
+    except (httpx.ConnectError, httpx.ConnectTimeout):
+        untag_outgoing_message(peer_id, params["snapshot_epoch"], count)
+        raise
 
 # --- Funções de Comunicação para Multicast (Q1) ---
 
@@ -19,10 +43,26 @@ async def send_message_to_peers(message: Message):
             
             url = f"http://{peer_name}:{PEER_PORT}/message"
             try:
-                await client.post(url, json=message.dict(), timeout=5.0)
+                await post_to_peer(client, url, peer_id_from_name(peer_name), json=message.dict(), timeout=5.0)
             except httpx.RequestError as e:
                 logger.error(f"Falha ao enviar mensagem para {peer_name}: {e}")
 
+async def send_messages_to_peers(messages: List[Message]):
+    """Envia um lote de mensagens de multicast em uma única requisição por par."""
+    my_fqdn = f"algoritmos-coord-{PROCESS_ID}.algoritmos-coord-service" # FQDN do Pod atual
+    logger.info(f"Enviando lote de {len(messages)} mensagens para os pares.")
+    payload = [message.dict() for message in messages]
+    async with httpx.AsyncClient() as client:
+        for peer_name in PEERS:
+            if peer_name == my_fqdn:
+                continue
+
+            url = f"http://{peer_name}:{PEER_PORT}/message-batch"
+            try:
+                await post_to_peer(client, url, peer_id_from_name(peer_name), count=len(messages), json=payload, timeout=5.0)
+            except httpx.RequestError as e:
+                logger.error(f"Falha ao enviar lote de mensagens para {peer_name}: {e}")
+
 async def send_acks_to_all_peers(message_id: str):
     """Envia confirmações (ACKs) para todos os processos, exceto a si mesmo."""
     logger.info(f"Enviando ACKs para a mensagem {message_id} para todos os pares (exceto self).")
@@ -45,7 +85,7 @@ async def send_acks_to_all_peers(message_id: str):
                 continue
             url = f"http://{peer_name}:{PEER_PORT}/ack"
             try:
-                await client.post(url, json=ack_message.dict(), timeout=5.0)
+                await post_to_peer(client, url, peer_id_from_name(peer_name), json=ack_message.dict(), timeout=5.0)
             except httpx.RequestError as e:
                 logger.error(f"Falha ao enviar ACK para {peer_name}: {e}")
 
@@ -63,7 +103,7 @@ async def send_request_to_peers(request_ts: int):
             url = f"http://{peer_name}:{PEER_PORT}/receive-request"
             payload = SCRequest(request_ts=request_ts, process_id=PROCESS_ID)
             try:
-                await client.post(url, json=payload.dict(), timeout=5.0) 
+                await post_to_peer(client, url, peer_id_from_name(peer_name), json=payload.dict(), timeout=5.0) 
             except httpx.RequestError as e:
                 logger.error(f"Falha ao enviar REQUEST para {peer_name}: {e}")
 
@@ -78,19 +118,32 @@ async def send_reply(target_peer_id: int):
     
     async with httpx.AsyncClient() as client:
         try:
-            await client.post(url, params=params, timeout=5.0)
+            await post_to_peer(client, url, target_peer_id, params, timeout=5.0)
         except httpx.RequestError as e:
             logger.error(f"Falha ao enviar REPLY para {target_peer_name}: {e}")
 
 
 # --- FUNÇÕES DE COMUNICAÇÃO PARA ELEIÇÃO (Q3) ---
 
-async def send_election_to_higher_priority_peers():
-    """Envia ELECTION para todos os processos com ID maior."""
+async def send_election_to_higher_priority_peers(term: int) -> int:
+    """Envia ELECTION para todos os processos com ID maior. Retorna quantos foram alcançados."""
     my_fqdn = f"algoritmos-coord-{PROCESS_ID}.algoritmos-coord-service"
     logger.info(f"P{PROCESS_ID} enviando ELECTION para processos com ID > {PROCESS_ID}.")
+
+    async def send_election(client: httpx.AsyncClient, peer_name: str, peer_id: int) -> bool:
+        url = f"http://{peer_name}:{PEER_PORT}/receive-election"
+        params = {"candidate_id": PROCESS_ID, "term": term}
+        ELECTION_MESSAGES_SENT["election"] += 1
+        try:
+            await post_to_peer(client, url, peer_id, params, timeout=5.0)
+            logger.info(f"ELECTION enviado para P{peer_id}.")
+            return True
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao enviar ELECTION para {peer_name}: {e}")
+            return False
     
     async with httpx.AsyncClient() as client:
+        sends = []
         for peer_name in PEERS:
             if peer_name == my_fqdn:
                 continue
@@ -102,44 +155,124 @@ async def send_election_to_higher_priority_peers():
             
             # Só envia para peers com ID maior
             if peer_id > PROCESS_ID:
-                url = f"http://{peer_name}:{PEER_PORT}/receive-election"
-                params = {"candidate_id": PROCESS_ID}
-                try:
-                    await client.post(url, params=params, timeout=5.0)
-                    logger.info(f"ELECTION enviado para P{peer_id}.")
-                except httpx.RequestError as e:
-                    logger.error(f"Falha ao enviar ELECTION para {peer_name}: {e}")
+                sends.append(send_election(client, peer_name, peer_id))
+
+        # Envios em paralelo: o processo mais forte recebe a ELECTION sem esperar pelos demais
+        results = await asyncio.gather(*sends)
+    return sum(results)
 
 
-async def send_answer_to_peer(candidate_id: int):
+async def send_answer_to_peer(candidate_id: int, term: int):
     """Envia ANSWER para um processo candidato."""
     target_peer_name = f"algoritmos-coord-{candidate_id}.algoritmos-coord-service"
     logger.info(f"P{PROCESS_ID} enviando ANSWER para P{candidate_id}.")
     
     url = f"http://{target_peer_name}:{PEER_PORT}/receive-answer"
-    params = {"peer_id": PROCESS_ID}
+    params = {"peer_id": PROCESS_ID, "term": term}
+    ELECTION_MESSAGES_SENT["answer"] += 1
     
     async with httpx.AsyncClient() as client:
         try:
-            await client.post(url, params=params, timeout=5.0)
+            await post_to_peer(client, url, candidate_id, params, timeout=5.0)
         except httpx.RequestError as e:
             logger.error(f"Falha ao enviar ANSWER para {target_peer_name}: {e}")
 
 
-async def send_coordinator_to_all_peers(leader_id: int):
+async def send_coordinator_to_peer(peer_id: int, leader_id: int, term: int):
+    """Envia COORDINATOR para um único processo (candidato atrasado em relação ao term atual)."""
+    target_peer_name = f"algoritmos-coord-{peer_id}.algoritmos-coord-service"
+    logger.info(f"P{PROCESS_ID} reenviando COORDINATOR (Líder: P{leader_id}, term {term}) para P{peer_id}.")
+
+    url = f"http://{target_peer_name}:{PEER_PORT}/receive-coordinator"
+    params = {"leader_id": leader_id, "term": term}
+    ELECTION_MESSAGES_SENT["coordinator"] += 1
+
+    async with httpx.AsyncClient() as client:
+        try:
+            await post_to_peer(client, url, peer_id, params, timeout=5.0)
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao enviar COORDINATOR para {target_peer_name}: {e}")
+
+
+async def send_coordinator_to_all_peers(leader_id: int, term: int):
     """Envia COORDINATOR para todos os processos."""
     my_fqdn = f"algoritmos-coord-{PROCESS_ID}.algoritmos-coord-service"
     logger.info(f"Enviando COORDINATOR (Líder: P{leader_id}) para todos os pares.")
+
+    async def send_coordinator(client: httpx.AsyncClient, peer_name: str):
+        url = f"http://{peer_name}:{PEER_PORT}/receive-coordinator"
+        params = {"leader_id": leader_id, "term": term}
+        ELECTION_MESSAGES_SENT["coordinator"] += 1
+        
+        try:
+            await post_to_peer(client, url, peer_id_from_name(peer_name), params, timeout=5.0)
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao enviar COORDINATOR para {peer_name}: {e}")
     
+    # Envios em paralelo: quanto antes o COORDINATOR chega, mais candidaturas são canceladas
+    async with httpx.AsyncClient() as client:
+        await asyncio.gather(*(
+            send_coordinator(client, peer_name) for peer_name in PEERS if peer_name != my_fqdn
+        ))
+
+
+async def send_ring_election(candidate_id: int, term: int) -> bool:
+    """Repassa o token da eleição em anel ao próximo processo ativo.
+
+    Tenta os sucessores em ordem (pulando os que não respondem). Retorna False se
+    nenhum outro processo puder ser alcançado.
+    """
+    params = {"candidate_id": candidate_id, "term": term, "sender_id": PROCESS_ID}
+
+    async with httpx.AsyncClient() as client:
+        for offset in range(1, TOTAL_PROCESSES):
+            successor_id = (PROCESS_ID + offset) % TOTAL_PROCESSES
+            successor_name = f"algoritmos-coord-{successor_id}.algoritmos-coord-service"
+            url = f"http://{successor_name}:{PEER_PORT}/receive-ring-election"
+            ELECTION_MESSAGES_SENT["ring"] += 1
+            try:
+                await post_to_peer(client, url, successor_id, params, timeout=5.0)
+                logger.info(f"Token de eleição (candidato P{candidate_id}, term {term}) enviado para P{successor_id}.")
+                return True
+            except httpx.RequestError as e:
+                logger.error(f"Falha ao enviar token de eleição para {successor_name}: {e}")
+    return False
+
+
+# --- FUNÇÕES DE COMUNICAÇÃO PARA O SNAPSHOT GLOBAL ---
+
+async def send_markers_to_peers(snapshot_id: int, initiator_id: Optional[int], sent_counts: dict):
+    """Envia o marcador do snapshot para todos os pares, com a contagem de mensagens de cada canal."""
+    my_fqdn = f"algoritmos-coord-{PROCESS_ID}.algoritmos-coord-service"
+    logger.info(f"Enviando MARKER do snapshot {snapshot_id} para todos os pares.")
+
     async with httpx.AsyncClient() as client:
         for peer_name in PEERS:
             if peer_name == my_fqdn:
                 continue
-            
-            url = f"http://{peer_name}:{PEER_PORT}/receive-coordinator"
-            params = {"leader_id": leader_id}
-            
+
+            peer_id = peer_id_from_name(peer_name)
+            url = f"http://{peer_name}:{PEER_PORT}/snapshot-marker"
+            marker = SnapshotMarker(
+                snapshot_id=snapshot_id,
+                sender_id=PROCESS_ID,
+                initiator_id=initiator_id,
+                sent_count=sent_counts.get(peer_id, 0),
+            )
             try:
-                await client.post(url, params=params, timeout=5.0)
+                await client.post(url, json=marker.dict(), timeout=5.0)
             except httpx.RequestError as e:
-                logger.error(f"Falha ao enviar COORDINATOR para {peer_name}: {e}")
\ No newline at end of file
+                logger.error(f"Falha ao enviar MARKER para {peer_name}: {e}")
+
+
+async def send_snapshot_report(initiator_id: int, report: LocalSnapshot):
+    """Envia o snapshot local concluído para o processo iniciador."""
+    target_peer_name = f"algoritmos-coord-{initiator_id}.algoritmos-coord-service"
+    logger.info(f"Enviando snapshot local {report.snapshot_id} para P{initiator_id}.")
+
+    url = f"http://{target_peer_name}:{PEER_PORT}/snapshot-report"
+    async with httpx.AsyncClient() as client:
+        try:
+            await client.post(url, json=report.dict(), timeout=5.0)
+        except httpx.RequestError as e:
+            logger.error(f"Falha ao enviar snapshot local para {target_peer_name}: {e}")
\ No newline at end of file
@@ -44,3 +44,31 @@ PEERS = [f"algoritmos-coord-{i}.algoritmos-coord-service" for i in range(TOTAL_P
 
 # Número total de processos no sistema, usado para verificar a conclusão dos ACKs.
 TOTAL_PROCESSES = len(PEERS)
+
+
+# --- Configurações para Clientes (SDK) ---
+
+# Quantidade máxima de entregas (Q1) e de pedidos de recurso (Q2) lembrados por processo
+# para que os clientes possam aguardar o resultado (endpoints /wait-delivery e /resource-status).
+CLIENT_TRACKING_LIMIT = int(os.getenv("CLIENT_TRACKING_LIMIT", 10000))
+
+# --- Configurações do Snapshot Global ---
+
+# Diretório onde o processo iniciador grava o snapshot consolidado (snapshot-{id}.json).
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "logs")
+
+# Tempo máximo (segundos) para fechar os canais de um snapshot. Canais ainda abertos
+# após esse prazo (ex: par fora do ar) são marcados como incompletos.
+SNAPSHOT_TIMEOUT = float(os.getenv("SNAPSHOT_TIMEOUT", 10))
+
+# --- Configurações de Eleição de Líder (Q3) ---
+
+# Algoritmo de eleição: "bully" (padrão) ou "ring" (Chang–Roberts, O(N) mensagens por eleição).
+ELECTION_MODE = os.getenv("ELECTION_MODE", "bully").lower()
+
+# Tempo máximo (segundos) de espera por ANSWER/COORDINATOR antes de assumir ou reiniciar a eleição.
+ELECTION_TIMEOUT = float(os.getenv("ELECTION_TIMEOUT", 3))
+
+# Atraso aleatório máximo (segundos) antes de se candidatar; escalado pela posição do processo
+# (o maior ID não espera), para evitar eleições sobrepostas.
+ELECTION_BACKOFF = float(os.getenv("ELECTION_BACKOFF", 0.5))
@@ -1,17 +1,16 @@
 # src/main.py (VERSÃO FINAL)
 import asyncio
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 import uvicorn
 import os
 import uuid
-from typing import Set
+from typing import Any, Dict, List, Set
 
 # Importações centralizadas
 from src.logger import logger
-from src.config import PROCESS_ID, PEERS, PEER_PORT
-from src.models import Message, Ack, SCRequest
-from src.process_logic import LOGICAL_CLOCK
+from src.config import PROCESS_ID, PEERS, PEER_PORT, ELECTION_MODE
+from src.models import Message, Ack, SCRequest, MessageBatch, DeliveryWait, SnapshotMarker, LocalSnapshot
 
 app = FastAPI(title=f"Processo P{PROCESS_ID} - Algoritmos Distribuídos")
 
@@ -20,46 +19,87 @@ app = FastAPI(title=f"Processo P{PROCESS_ID} - Algoritmos Distribuídos")
 background_tasks: Set[asyncio.Task] = set()
 
 
-def create_background_task(coroutine):
+def create_background_task(coroutine, name: str = None):
     """Cria e gerencia uma tarefa em background."""
-    logger.info(f"Agendando a corrotina '{coroutine.__name__}' para execução em background.")
+    logger.info(f"Agendando a corrotina '{name or coroutine.__name__}' para execução em background.")
     task = asyncio.create_task(coroutine)
     background_tasks.add(task)
     # Adiciona um callback para remover a tarefa do conjunto quando ela terminar
     task.add_done_callback(background_tasks.discard)
 
 
+def create_peer_message_task(sender_id: int, snapshot_epoch: int, kind: str, payload: Dict[str, Any], coroutine):
+    """Agenda o tratamento de uma mensagem vinda de outro processo.
+
+    A mensagem é contabilizada no snapshot global no mesmo passo do event loop em que
+    o tratador começa a alterar o estado local, para que o snapshot continue consistente.
+    """
+    from .snapshot import record_incoming_message
+
+    async def record_and_handle():
+        record_incoming_message(sender_id, snapshot_epoch, kind, payload)
+        await coroutine
+
+    create_background_task(record_and_handle(), name=coroutine.__name__)
+
+
 # --- Endpoints da API ---
 
 @app.get("/")
 def read_root():
     """Endpoint de status para verificar a saúde e o estado atual do processo."""
-    return {"process_id": PROCESS_ID, "current_clock": LOGICAL_CLOCK, "status": "Running"}
+    from . import process_logic
+    return {"process_id": PROCESS_ID, "current_clock": process_logic.LOGICAL_CLOCK, "status": "Running"}
+
+@app.get("/leader")
+def read_leader():
+    """Informa o líder conhecido por este processo (usado para roteamento pelos clientes)."""
+    from . import process_logic
+    return {
+        "process_id": PROCESS_ID,
+        "leader_id": process_logic.CURRENT_LEADER,
+        "leader_state": process_logic.LEADER_STATE,
+        "leader_term": process_logic.LEADER_TERM,
+    }
 
 # --- Endpoints para Exclusão Mútua (Q2) ---
 
 @app.post("/request-resource", status_code=202)
 async def request_resource_endpoint():
     """Inicia o pedido de acesso à região crítica."""
-    from .process_logic import request_resource_access
+    from .process_logic import request_resource_access, set_resource_request_status
     logger.info("Endpoint /request-resource chamado.")
-    create_background_task(request_resource_access())
-    return {"status": "Resource request initiated. Processing in background."}
+    request_id = str(uuid.uuid4())
+    set_resource_request_status(request_id, "PENDING")
+    create_background_task(request_resource_access(request_id))
+    return {"status": "Resource request initiated. Processing in background.", "request_id": request_id}
+
+@app.get("/resource-status/{request_id}")
+async def resource_status_endpoint(request_id: str, timeout: float = 0.0):
+    """Consulta (ou aguarda por até `timeout` segundos) a decisão sobre um pedido de recurso."""
+    from .process_logic import wait_for_resource_request
+    status = await wait_for_resource_request(request_id, timeout)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Pedido {request_id} desconhecido.")
+    return {"request_id": request_id, "status": status}
 
 @app.post("/receive-request", status_code=202)
-async def receive_request_endpoint(request: SCRequest):
+async def receive_request_endpoint(request: SCRequest, snapshot_epoch: int = 0):
     """Recebe um pedido de recurso de outro processo."""
     from .process_logic import handle_resource_request
     logger.info(f"Recebido REQUEST de P{request.process_id} com TS={request.request_ts}.")
-    create_background_task(handle_resource_request(request.request_ts, request.process_id))
+    create_peer_message_task(
+        request.process_id, snapshot_epoch, "request", {"request_ts": request.request_ts},
+        handle_resource_request(request.request_ts, request.process_id)
+    )
     return {"status": "Request received. Processing in background."}
 
 @app.post("/receive-reply", status_code=202)
-async def receive_reply_endpoint(sender_id: int):
+async def receive_reply_endpoint(sender_id: int, snapshot_epoch: int = 0):
     """Recebe uma resposta (REPLY) de outro processo."""
     from .process_logic import handle_reply
     logger.info(f"Recebido REPLY de P{sender_id}.")
-    create_background_task(handle_reply())
+    create_peer_message_task(sender_id, snapshot_epoch, "reply", {}, handle_reply())
     return {"status": "Reply received. Processing in background."}
 
 # --- Endpoints para Eleição de Líder (Q3) ---
@@ -73,52 +113,101 @@ async def start_election_endpoint():
     return {"status": "Election started. Processing in background."}
 
 @app.post("/receive-election", status_code=202)
-async def receive_election_endpoint(candidate_id: int):
+async def receive_election_endpoint(candidate_id: int, term: int = 0, snapshot_epoch: int = 0):
     """Recebe uma mensagem de ELECTION de outro processo."""
     from .process_logic import handle_election_message
     logger.info(f"Recebido ELECTION de P{candidate_id}.")
-    create_background_task(handle_election_message(candidate_id))
+    create_peer_message_task(
+        candidate_id, snapshot_epoch, "election", {"term": term}, handle_election_message(candidate_id, term)
+    )
     return {"status": "Election message received. Processing in background."}
 
+@app.post("/receive-ring-election", status_code=202)
+async def receive_ring_election_endpoint(candidate_id: int, term: int, sender_id: int, snapshot_epoch: int = 0):
+    """Recebe o token da eleição em anel do processo antecessor."""
+    from .process_logic import handle_ring_election_message
+    logger.info(f"Recebido token de eleição em anel de P{sender_id} (candidato P{candidate_id}, term {term}).")
+    create_peer_message_task(
+        sender_id, snapshot_epoch, "ring-election", {"candidate_id": candidate_id, "term": term},
+        handle_ring_election_message(candidate_id, term)
+    )
+    return {"status": "Ring election message received. Processing in background."}
+
 @app.post("/receive-answer", status_code=202)
-async def receive_answer_endpoint(peer_id: int):
+async def receive_answer_endpoint(peer_id: int, term: int = 0, snapshot_epoch: int = 0):
     """Recebe uma mensagem de ANSWER durante uma eleição."""
     from .process_logic import handle_answer_message
     logger.info(f"Recebido ANSWER de P{peer_id}.")
-    create_background_task(handle_answer_message(peer_id))
+    create_peer_message_task(peer_id, snapshot_epoch, "answer", {"term": term}, handle_answer_message(peer_id, term))
     return {"status": "Answer message received. Processing in background."}
 
 @app.post("/receive-coordinator", status_code=202)
-async def receive_coordinator_endpoint(leader_id: int):
+async def receive_coordinator_endpoint(leader_id: int, term: int = 0, snapshot_epoch: int = 0):
     """Recebe notificação de um novo líder."""
     from .process_logic import handle_coordinator_message
     logger.info(f"Recebido COORDINATOR notificando P{leader_id} como novo líder.")
-    create_background_task(handle_coordinator_message(leader_id))
+    create_peer_message_task(
+        leader_id, snapshot_epoch, "coordinator", {"term": term}, handle_coordinator_message(leader_id, term)
+    )
     return {"status": "Coordinator message received. Processing in background."}
 
+@app.get("/election-stats")
+def read_election_stats():
+    """Term, líder e contagem de mensagens de eleição enviadas (usado pelo benchmark de eleição)."""
+    from . import process_logic
+    return {
+        "process_id": PROCESS_ID,
+        "mode": ELECTION_MODE,
+        "term": process_logic.ELECTION_TERM,
+        "leader_id": process_logic.CURRENT_LEADER,
+        "leader_term": process_logic.LEADER_TERM,
+        "leader_since": process_logic.LEADER_SINCE,
+        "messages_sent": dict(process_logic.ELECTION_MESSAGES_SENT),
+    }
+
 # --- Endpoints da API para Multicast (Q1) - Mantidos para compatibilidade ---
 
 @app.post("/message")
-async def receive_message_endpoint(message: Message):
+async def receive_message_endpoint(message: Message, snapshot_epoch: int = 0):
     from .process_logic import receive_and_enqueue_message
     logger.info(f"Recebido MENSAGEM de P{message.sender_id} (TS: {message.timestamp})")
-    create_background_task(receive_and_enqueue_message(message))
+    create_peer_message_task(
+        message.sender_id, snapshot_epoch, "message", {"message_id": message.message_id, "ts": message.timestamp},
+        receive_and_enqueue_message(message)
+    )
     return {"status": "Message received and enqueued."}
 
+@app.post("/message-batch")
+async def receive_message_batch_endpoint(messages: List[Message], snapshot_epoch: int = 0):
+    from .process_logic import receive_and_enqueue_message
+    logger.info(f"Recebido LOTE de {len(messages)} mensagens.")
+    # Cada mensagem do lote conta como uma mensagem no canal (o remetente contabiliza o lote inteiro)
+    for message in messages:
+        create_peer_message_task(
+            message.sender_id, snapshot_epoch, "message", {"message_id": message.message_id, "ts": message.timestamp},
+            receive_and_enqueue_message(message)
+        )
+    return {"status": "Messages received and enqueued."}
+
 @app.post("/ack")
-async def receive_ack_endpoint(ack: Ack):
+async def receive_ack_endpoint(ack: Ack, snapshot_epoch: int = 0):
     from .process_logic import receive_ack
+    from .snapshot import record_incoming_message
     logger.info(f"Recebido ACK para mensagem {ack.message_id}")
+    record_incoming_message(ack.process_id, snapshot_epoch, "ack", {"message_id": ack.message_id})
     receive_ack(ack.message_id)
     return {"status": "ACK processed."}
 
-@app.post("/send")
-async def send_multicast_message(content: str):
-    from .communication import send_message_to_peers
-    from .process_logic import update_clock, receive_and_enqueue_message
+def build_multicast_message(content: str, delay_trigger: bool = True) -> Message:
+    """Cria uma nova mensagem de multicast com o próximo timestamp de Lamport.
+
+    Com `delay_trigger`, mensagens "com atraso" recebem o ID fixo do teste de atraso (Q1).
+    Sem ele, o ID é sempre único, como exigem os clientes que aguardam a entrega por ID.
+    """
+    from .process_logic import update_clock
 
     # Lógica para acionar o atraso de teste
-    is_delayed_message = "com atraso" in content.lower()
+    is_delayed_message = delay_trigger and "com atraso" in content.lower()
     msg_id = "MSG_PARA_ATRASAR" if is_delayed_message else str(uuid.uuid4())
 
     new_timestamp = update_clock()
@@ -133,6 +222,14 @@ async def send_multicast_message(content: str):
     if is_delayed_message:
         log_msg += " (com gatilho de atraso)"
     logger.info(log_msg)
+    return new_message
+
+@app.post("/send")
+async def send_multicast_message(content: str):
+    from .communication import send_message_to_peers
+    from .process_logic import receive_and_enqueue_message
+
+    new_message = build_multicast_message(content)
 
     create_background_task(send_message_to_peers(new_message))
     create_background_task(receive_and_enqueue_message(new_message))
@@ -141,6 +238,64 @@ async def send_multicast_message(content: str):
         content={"status": "Multicast initiated.", "message_id": new_message.message_id},
         status_code=200
     )
+
+@app.post("/send-batch")
+async def send_multicast_batch(batch: MessageBatch):
+    """Inicia o multicast de um lote de mensagens com uma requisição por par."""
+    from .communication import send_messages_to_peers
+    from .process_logic import receive_and_enqueue_message
+
+    # IDs únicos: o ID fixo do teste de atraso faria uma entrega anterior confirmar esta mensagem
+    new_messages = [build_multicast_message(content, delay_trigger=False) for content in batch.contents]
+
+    create_background_task(send_messages_to_peers(new_messages))
+    for new_message in new_messages:
+        create_background_task(receive_and_enqueue_message(new_message))
+
+    return {"status": "Multicast initiated.", "message_ids": [m.message_id for m in new_messages]}
+
+@app.post("/wait-delivery")
+async def wait_delivery_endpoint(request: DeliveryWait, timeout: float = 30.0):
+    """Aguarda por até `timeout` segundos a entrega em ordem total das mensagens informadas."""
+    from .process_logic import wait_for_deliveries
+    delivered = await wait_for_deliveries(request.message_ids, timeout)
+    pending = [m for m in request.message_ids if m not in delivered]
+    return {"delivered": delivered, "pending": pending}
+# --- Endpoints para o Snapshot Global ---
+
+@app.post("/snapshot", status_code=202)
+async def start_snapshot_endpoint():
+    """Inicia um snapshot global consistente sem interromper o tráfego."""
+    from .snapshot import start_snapshot
+    logger.info("Endpoint /snapshot chamado. Iniciando snapshot global...")
+    snapshot_id = start_snapshot()
+    if snapshot_id is None:
+        raise HTTPException(status_code=409, detail="Já existe um snapshot em andamento.")
+    return {"status": "Snapshot started. Processing in background.", "snapshot_id": snapshot_id}
+
+@app.get("/snapshot/{snapshot_id}")
+async def read_snapshot_endpoint(snapshot_id: int):
+    """Retorna o snapshot consolidado (disponível no processo iniciador)."""
+    from .snapshot import get_snapshot
+    merged = get_snapshot(snapshot_id)
+    if merged is None:
+        raise HTTPException(status_code=404, detail=f"Snapshot {snapshot_id} não concluído ou não iniciado aqui.")
+    return merged
+
+@app.post("/snapshot-marker")
+async def receive_marker_endpoint(marker: SnapshotMarker):
+    """Recebe o marcador do snapshot de outro processo."""
+    from .snapshot import handle_marker
+    handle_marker(marker.snapshot_id, marker.sender_id, marker.initiator_id, marker.sent_count)
+    return {"status": "Marker processed."}
+
+@app.post("/snapshot-report")
+async def receive_snapshot_report_endpoint(report: LocalSnapshot):
+    """Recebe o snapshot local de outro processo (no processo iniciador)."""
+    from .snapshot import receive_snapshot_report
+    receive_snapshot_report(report)
+    return {"status": "Snapshot report received."}
+
 # --- Função para iniciar o servidor ---
 
 def start():
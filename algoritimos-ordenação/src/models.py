@@ -1,6 +1,6 @@
 # src/models.py
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List, Optional
 
 class Message(BaseModel):
     """
@@ -21,4 +21,27 @@ class Ack(BaseModel):
 class SCRequest(BaseModel):
     """Mensagem de Requisição de Seção Crítica (SC)."""
     request_ts: int
-    process_id: int
\ No newline at end of file
+    process_id: int
+
+class MessageBatch(BaseModel):
+    """Lote de conteúdos enviados por um cliente para multicast (Q1)."""
+    contents: List[str]
+
+class DeliveryWait(BaseModel):
+    """Mensagens cuja entrega em ordem total um cliente deseja aguardar (Q1)."""
+    message_ids: List[str]
+
+class SnapshotMarker(BaseModel):
+    """Marcador do snapshot global, com o número de mensagens enviadas no canal antes do registro."""
+    snapshot_id: int
+    sender_id: int
+    initiator_id: Optional[int]  # None quando o remetente ainda não conhece o iniciador
+    sent_count: int
+
+class LocalSnapshot(BaseModel):
+    """Estado registrado por um processo e as mensagens em trânsito em seus canais de entrada."""
+    snapshot_id: int
+    process_id: int
+    state: Dict[str, Any]
+    channels: Dict[int, List[Dict[str, Any]]]
+    incomplete_channels: List[int]
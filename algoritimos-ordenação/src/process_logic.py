@@ -1,11 +1,16 @@
 import threading
 import heapq
 import time
+import random
 import asyncio
-from typing import Dict, List, Any
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple
 from src.models import Message
 from src.logger import logger
-from src.config import TOTAL_PROCESSES, PROCESS_ID
+from src.config import (
+    TOTAL_PROCESSES, PROCESS_ID, CLIENT_TRACKING_LIMIT,
+    ELECTION_MODE, ELECTION_TIMEOUT, ELECTION_BACKOFF,
+)
 
 # --- Estado do Processo ---
 
@@ -18,6 +23,11 @@ PENDING_QUEUE: List[Any] = []
 # 3. Tabela de ACKs (Confirmações) - para Multicast Q1
 ACK_TABLE: Dict[str, int] = {}
 
+# 4. Mensagens já entregues em ordem total (message_id -> TS original) - para clientes (Q1)
+DELIVERED_MESSAGES: "OrderedDict[str, int]" = OrderedDict()
+# Eventos dos clientes aguardando a entrega de cada mensagem (um evento por long-poll em andamento)
+DELIVERY_EVENTS: Dict[str, Set[asyncio.Event]] = {}
+
 # Mutex para proteger o acesso concorrente às estruturas de estado
 STATE_LOCK = threading.Lock()
 
@@ -29,6 +39,10 @@ PENDING_REPLIES_COUNT = 0
 # Fila para guardar pedidos (process_id) que chegaram enquanto usávamos o recurso
 DEFERRED_REPLIES: List[int] = []
 REPLY_EVENT = asyncio.Event()
+# Situação dos pedidos feitos pelos clientes (request_id -> "PENDING", "GRANTED" ou "REJECTED")
+RESOURCE_REQUESTS: "OrderedDict[str, str]" = OrderedDict()
+RESOURCE_REQUEST_EVENTS: Dict[str, asyncio.Event] = {}
+CURRENT_REQUEST_ID: Optional[str] = None
 
 # --- Estado para Eleição de Líder (Q3 - Algoritmo de Bully) ---
 # Estados possíveis: "FOLLOWER", "CANDIDATE", "LEADER"
@@ -38,6 +52,21 @@ ELECTION_IN_PROGRESS = False
 ELECTION_ANSWERS_RECEIVED: List[int] = []  # Processos que responderam à eleição
 HIGHEST_PRIORITY_ID = -1  # ID mais alto visto durante eleição
 
+# Épocas (terms) de eleição: cada rodada de eleição tem um term, e cada processo se candidata
+# no máximo uma vez por term. Gatilhos simultâneos caem no mesmo term e são coalescidos.
+ELECTION_TERM = 0         # Maior term de eleição já visto
+LEADER_TERM = -1          # Term em que o líder atual foi eleito
+CANDIDATE_TERM = -1       # Último term em que este processo se candidatou (ou agendou candidatura)
+ANSWER_EVENT: Optional[asyncio.Event] = None       # Sinalizado no primeiro ANSWER da candidatura atual
+COORDINATOR_EVENT: Optional[asyncio.Event] = None  # Sinalizado quando um líder é anunciado
+LEADER_SINCE: Optional[float] = None               # Instante (time.time()) em que o líder atual foi aceito
+# Tokens da eleição em anel já repassados por este processo (term, candidato). Um token que
+# chega pela segunda vez perdeu seu candidato (falhou durante a volta) e é descartado.
+RING_FORWARDED: Set[Tuple[int, int]] = set()
+
+# Mensagens de eleição enviadas por este processo (usado pelo benchmark de eleição)
+ELECTION_MESSAGES_SENT: Dict[str, int] = {"election": 0, "answer": 0, "coordinator": 0, "ring": 0}
+
 # --- Funções de Lógica do Algoritmo de Multicast (Q1) ---
 
 def update_clock(received_timestamp: int = 0) -> int:
@@ -83,6 +112,7 @@ def try_to_process_messages():
                 processed_message_tuple = heapq.heappop(PENDING_QUEUE)
                 if message.message_id in ACK_TABLE:
                     del ACK_TABLE[message.message_id]
+                mark_message_delivered(processed_message_tuple[2])
             
             p_msg = processed_message_tuple[2]
             logger.success(
@@ -92,6 +122,41 @@ def try_to_process_messages():
         else:
             break
 
+def mark_message_delivered(message: Message):
+    """Registra a entrega de uma mensagem e acorda os clientes que a aguardam."""
+    DELIVERED_MESSAGES[message.message_id] = message.timestamp
+    while len(DELIVERED_MESSAGES) > CLIENT_TRACKING_LIMIT:
+        DELIVERED_MESSAGES.popitem(last=False)
+
+    for event in DELIVERY_EVENTS.pop(message.message_id, ()):
+        event.set()
+
+async def wait_for_deliveries(message_ids: List[str], timeout: float) -> List[str]:
+    """Aguarda, por até `timeout` segundos, a entrega de alguma das mensagens informadas.
+
+    Retorna assim que a primeira mensagem pendente é entregue, para que o cliente não espere
+    pela mais lenta do lote. Retorna a lista das mensagens já entregues (em ordem total) neste processo.
+    """
+    pending = [m for m in message_ids if m not in DELIVERED_MESSAGES]
+    if pending and len(pending) == len(message_ids):
+        event = asyncio.Event()
+        for m in pending:
+            DELIVERY_EVENTS.setdefault(m, set()).add(event)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Mensagens nunca entregues não podem deixar eventos esquecidos em DELIVERY_EVENTS
+            for m in pending:
+                waiters = DELIVERY_EVENTS.get(m)
+                if waiters is not None:
+                    waiters.discard(event)
+                    if not waiters:
+                        del DELIVERY_EVENTS[m]
+
+    return [m for m in message_ids if m in DELIVERED_MESSAGES]
+
 def receive_ack(message_id: str):
     """Processa um ACK recebido de outro processo."""
     update_clock()
@@ -109,10 +174,34 @@ def receive_ack(message_id: str):
 
 # --- Funções de Lógica para Exclusão Mútua (Q2) ---
 
-async def request_resource_access():
+def set_resource_request_status(request_id: str, status: str):
+    """Atualiza a situação de um pedido de recurso e acorda quem o aguarda."""
+    RESOURCE_REQUESTS[request_id] = status
+    while len(RESOURCE_REQUESTS) > CLIENT_TRACKING_LIMIT:
+        RESOURCE_REQUESTS.popitem(last=False)
+
+    if status != "PENDING":
+        event = RESOURCE_REQUEST_EVENTS.pop(request_id, None)
+        if event is not None:
+            event.set()
+
+async def wait_for_resource_request(request_id: str, timeout: float) -> Optional[str]:
+    """Aguarda, por até `timeout` segundos, a decisão sobre um pedido de recurso.
+
+    Retorna a situação do pedido ou None se o pedido for desconhecido.
+    """
+    if RESOURCE_REQUESTS.get(request_id) == "PENDING":
+        event = RESOURCE_REQUEST_EVENTS.setdefault(request_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    return RESOURCE_REQUESTS.get(request_id)
+
+async def request_resource_access(request_id: Optional[str] = None):
     """Inicia a solicitação de acesso à região crítica."""
     from src.communication import send_request_to_peers
-    global WAITING_FOR_RESOURCE, REQUEST_TIMESTAMP, PENDING_REPLIES_COUNT, LOGICAL_CLOCK
+    global WAITING_FOR_RESOURCE, REQUEST_TIMESTAMP, PENDING_REPLIES_COUNT, LOGICAL_CLOCK, CURRENT_REQUEST_ID
     
     # 1. Obter o novo timestamp FORA do lock (boa prática)
     current_ts = update_clock()
@@ -120,8 +209,11 @@ async def request_resource_access():
     with STATE_LOCK:
         if RESOURCE_IN_USE or WAITING_FOR_RESOURCE:
             logger.warning("Pedido de recurso ignorado: já está em uso ou na fila.")
+            if request_id is not None:
+                set_resource_request_status(request_id, "REJECTED")
             return
 
+        CURRENT_REQUEST_ID = request_id
         WAITING_FOR_RESOURCE = True
         REQUEST_TIMESTAMP = current_ts
         PENDING_REPLIES_COUNT = TOTAL_PROCESSES - 1
@@ -194,6 +286,8 @@ async def enter_critical_section():
     with STATE_LOCK:
         WAITING_FOR_RESOURCE = False
         RESOURCE_IN_USE = True
+        if CURRENT_REQUEST_ID is not None:
+            set_resource_request_status(CURRENT_REQUEST_ID, "GRANTED")
     
     logger.success(">>> ACESSO OBTIDO! Entrando na Região Crítica. <<<")
     
@@ -222,95 +316,298 @@ async def release_resource():
         await send_reply(requester_id)
 
 
-# --- Funções para Eleição de Líder (Q3 - Algoritmo de Bully) ---
+# --- Funções para Eleição de Líder (Q3 - Bully ou Anel) ---
 
 async def start_election():
-    """Inicia uma eleição de líder usando o Algoritmo de Bully."""
-    from src.communication import send_election_to_higher_priority_peers
-    global ELECTION_IN_PROGRESS, LEADER_STATE, CURRENT_LEADER, ELECTION_ANSWERS_RECEIVED, HIGHEST_PRIORITY_ID
-    
+    """Inicia uma nova rodada de eleição (novo term)."""
+    with STATE_LOCK:
+        term = ELECTION_TERM + 1
+    logger.info(f"Pedido de eleição recebido. Abrindo o term {term}.")
+    schedule_election(term)
+
+
+def election_backoff() -> float:
+    """Atraso aleatório antes de se candidatar, proporcional à posição do processo.
+
+    O processo de maior ID não espera; os demais esperam mais quanto menor o ID, o que dá
+    tempo para o COORDINATOR do processo mais forte chegar e cancelar as outras candidaturas.
+    """
+    rank = (TOTAL_PROCESSES - 1 - PROCESS_ID) / max(TOTAL_PROCESSES - 1, 1)
+    return random.uniform(0, ELECTION_BACKOFF * rank)
+
+
+def schedule_election(term: int):
+    """Agenda a candidatura deste processo no `term`, coalescendo gatilhos repetidos."""
+    from src.main import create_background_task
+    global CANDIDATE_TERM, ELECTION_TERM
+
+    with STATE_LOCK:
+        ELECTION_TERM = max(ELECTION_TERM, term)
+        if CANDIDATE_TERM >= term or LEADER_TERM >= term:
+            logger.info(f"Eleição do term {term} já em andamento ou decidida. Gatilho coalescido.")
+            return
+        CANDIDATE_TERM = term
+
+    create_background_task(run_candidacy(term))
+
+
+async def run_candidacy(term: int):
+    """Espera o backoff e, se nenhum líder foi anunciado no term, executa a candidatura."""
+    delay = election_backoff()
+    if delay > 0:
+        logger.info(f"Aguardando backoff de {delay:.3f}s antes de se candidatar no term {term}.")
+        await asyncio.sleep(delay)
+
     with STATE_LOCK:
-        if ELECTION_IN_PROGRESS:
-            logger.warning("Uma eleição já está em progresso.")
+        if LEADER_TERM >= term or ELECTION_TERM > term:
+            logger.info(f"Candidatura no term {term} cancelada: eleição já decidida ou superada.")
             return
-        
+
+    if ELECTION_MODE == "ring":
+        await run_ring_candidacy(term)
+    else:
+        await run_bully_candidacy(term)
+
+
+async def run_bully_candidacy(term: int):
+    """Candidatura pelo Algoritmo de Bully."""
+    from src.communication import send_election_to_higher_priority_peers
+    global ELECTION_IN_PROGRESS, LEADER_STATE, ELECTION_ANSWERS_RECEIVED, HIGHEST_PRIORITY_ID
+    global ANSWER_EVENT, COORDINATOR_EVENT
+
+    with STATE_LOCK:
         ELECTION_IN_PROGRESS = True
         LEADER_STATE = "CANDIDATE"
         ELECTION_ANSWERS_RECEIVED = []
         HIGHEST_PRIORITY_ID = PROCESS_ID
-        logger.info(f">>> INICIANDO ELEIÇÃO <<< P{PROCESS_ID} está se candidatando a líder.")
+        ANSWER_EVENT = asyncio.Event()
+        COORDINATOR_EVENT = asyncio.Event()
+        answer_event, coordinator_event = ANSWER_EVENT, COORDINATOR_EVENT
+        logger.info(f">>> INICIANDO ELEIÇÃO <<< P{PROCESS_ID} está se candidatando a líder (term {term}).")
+
+    # Envia ELECTION para todos os processos com ID maior. Se nenhum deles pôde ser
+    # contatado, não há quem responda: não é preciso esperar o timeout.
+    reached = await send_election_to_higher_priority_peers(term)
+    if reached > 0:
+        logger.info(f"Aguardando respostas por até {ELECTION_TIMEOUT}s...")
+        try:
+            await asyncio.wait_for(answer_event.wait(), timeout=ELECTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
 
-    # Envia ELECTION para todos os processos com ID maior
-    await send_election_to_higher_priority_peers()
-    
-    # Aguarda respostas por um tempo fixo (timeout)
-    timeout = 3  # segundos
-    logger.info(f"Aguardando respostas por {timeout}s...")
-    await asyncio.sleep(timeout)
-    
-    # Se nenhum processo respondeu, este processo vira o líder
     with STATE_LOCK:
-        if len(ELECTION_ANSWERS_RECEIVED) == 0:
-            logger.success(f">>> NOVO LÍDER ELEITO <<< P{PROCESS_ID} é o novo LÍDER!")
-            LEADER_STATE = "LEADER"
-            CURRENT_LEADER = PROCESS_ID
+        if LEADER_TERM >= term:
             ELECTION_IN_PROGRESS = False
+            return
+        if not answer_event.is_set():
+            elected = True
         else:
             logger.info(f"Eleição em progresso: {len(ELECTION_ANSWERS_RECEIVED)} processos responderam.")
             LEADER_STATE = "FOLLOWER"
             ELECTION_IN_PROGRESS = False
-            return
+            elected = False
+
+    if elected:
+        await become_leader(term)
+        return
+
+    # Um processo mais forte respondeu: aguarda o COORDINATOR dele. Se não vier,
+    # abre um novo term (o processo que respondeu pode ter falhado).
+    try:
+        await asyncio.wait_for(coordinator_event.wait(), timeout=ELECTION_TIMEOUT)
+    except asyncio.TimeoutError:
+        with STATE_LOCK:
+            undecided = LEADER_TERM < term and ELECTION_TERM == term
+        if undecided:
+            logger.warning(f"Nenhum COORDINATOR no term {term}. Reiniciando eleição.")
+            schedule_election(term + 1)
 
-    # Se este processo se tornou líder, notifica todos os outros
-    if LEADER_STATE == "LEADER":
-        await broadcast_coordinator(PROCESS_ID)
 
+async def run_ring_candidacy(term: int):
+    """Candidatura pelo algoritmo em anel (Chang–Roberts): O(N) mensagens por eleição."""
+    from src.communication import send_ring_election
+    global ELECTION_IN_PROGRESS, LEADER_STATE, COORDINATOR_EVENT
 
-async def handle_election_message(candidate_id: int):
-    """Recebe uma mensagem de ELECTION de um processo candidato."""
-    from src.communication import send_answer_to_peer
-    global ELECTION_ANSWERS_RECEIVED, LEADER_STATE, ELECTION_IN_PROGRESS
+    with STATE_LOCK:
+        ELECTION_IN_PROGRESS = True
+        LEADER_STATE = "CANDIDATE"
+        COORDINATOR_EVENT = asyncio.Event()
+        coordinator_event = COORDINATOR_EVENT
+        logger.info(f">>> INICIANDO ELEIÇÃO (ANEL) <<< P{PROCESS_ID} envia sua candidatura (term {term}).")
+
+    if not await send_ring_election(PROCESS_ID, term):
+        # Nenhum sucessor alcançável: este processo é o único ativo
+        await become_leader(term)
+        return
+
+    # O token pode se perder se um processo cair durante a volta no anel
+    try:
+        await asyncio.wait_for(coordinator_event.wait(), timeout=ELECTION_TIMEOUT * 2)
+    except asyncio.TimeoutError:
+        with STATE_LOCK:
+            undecided = LEADER_TERM < term and ELECTION_TERM == term
+        if undecided:
+            logger.warning(f"Token da eleição do term {term} não retornou. Reiniciando eleição.")
+            schedule_election(term + 1)
+
+
+async def handle_election_message(candidate_id: int, term: int = 0):
+    """Recebe uma mensagem de ELECTION de um processo candidato (Bully)."""
+    from src.communication import send_answer_to_peer, send_coordinator_to_peer
     
-    logger.info(f"Recebido ELECTION de P{candidate_id}.")
+    logger.info(f"Recebido ELECTION de P{candidate_id} (term {term}).")
     
-    # Se o nosso ID é maior, respondemos ANSWER e iniciamos nossa própria eleição
-    if PROCESS_ID > candidate_id:
-        logger.info(f"P{PROCESS_ID} > P{candidate_id}: Respondendo ANSWER e iniciando eleição própria.")
-        await send_answer_to_peer(candidate_id)
-        
-        # Inicia eleição deste processo se ainda não há uma em progresso
-        if not ELECTION_IN_PROGRESS:
-            await start_election()
-    else:
+    if PROCESS_ID <= candidate_id:
         logger.info(f"P{PROCESS_ID} <= P{candidate_id}: Não respondendo. Aguardando COORDINATOR.")
+        return
+
+    with STATE_LOCK:
+        leader_id, leader_term = CURRENT_LEADER, LEADER_TERM
+        # O candidato está atrasado (ex.: reiniciou e perdeu o term): se o term dele já foi
+        # decidido por um líder mais forte, basta reenviar o COORDINATOR atual para ele.
+        decided = leader_id is not None and leader_term >= term and leader_id > candidate_id
+        # Se o líder conhecido é mais fraco que o candidato, a eleição precisa de um term novo
+        election_term = ELECTION_TERM + 1 if leader_term >= term else term
+
+    if decided:
+        logger.info(f"Term {term} já decidido (P{leader_id}, term {leader_term}). Atualizando P{candidate_id}.")
+        await send_coordinator_to_peer(candidate_id, leader_id, leader_term)
+        return
+
+    # Respondemos ANSWER e agendamos nossa própria candidatura. Várias ELECTIONs do mesmo
+    # term resultam em uma única candidatura.
+    logger.info(f"P{PROCESS_ID} > P{candidate_id}: Respondendo ANSWER e agendando candidatura própria.")
+    schedule_election(election_term)
+    await send_answer_to_peer(candidate_id, term)
 
 
-async def handle_answer_message(peer_id: int):
+async def handle_ring_election_message(candidate_id: int, term: int):
+    """Recebe o token de eleição em anel e o repassa ao sucessor (Chang–Roberts)."""
+    from src.main import create_background_task
+    from src.communication import send_ring_election, send_coordinator_to_peer
+    global ELECTION_TERM, CANDIDATE_TERM, RING_FORWARDED
+
+    with STATE_LOCK:
+        leader_id, leader_term = CURRENT_LEADER, LEADER_TERM
+        resend_coordinator = False
+        if leader_term >= term or term < ELECTION_TERM:
+            if candidate_id == PROCESS_ID or leader_id is None:
+                logger.info(f"Token de P{candidate_id} do term {term} obsoleto. Descartando.")
+                return
+            if leader_id >= candidate_id:
+                # Candidato atrasado (ex.: reiniciou): o term dele já foi decidido por um líder mais forte
+                resend_coordinator = True
+            else:
+                # Candidato mais forte que o líder conhecido: o token segue num term novo
+                term = ELECTION_TERM + 1
+
+        if not resend_coordinator:
+            watch = False
+            if candidate_id == PROCESS_ID:
+                forward_id = None  # O token deu a volta: somos o maior ID ativo
+            elif (term, candidate_id) in RING_FORWARDED:
+                # O token já passou por aqui: o candidato falhou durante a volta no anel
+                logger.warning(f"Token de P{candidate_id} (term {term}) voltou sem o candidato. Descartando.")
+                return
+            elif candidate_id > PROCESS_ID:
+                forward_id = candidate_id
+                # Sem candidatura própria neste term, ninguém aqui reiniciaria a eleição se o token se perder
+                watch = CANDIDATE_TERM < term
+                CANDIDATE_TERM = max(CANDIDATE_TERM, term)
+            elif CANDIDATE_TERM < term:
+                forward_id = PROCESS_ID  # Substitui o candidato pelo nosso ID (maior)
+                CANDIDATE_TERM = term
+            else:
+                # Já enviamos nosso próprio token neste term: o token de menor ID é suprimido
+                logger.info(f"Token de P{candidate_id} suprimido: P{PROCESS_ID} já participa do term {term}.")
+                return
+            ELECTION_TERM = term
+            if forward_id is not None:
+                RING_FORWARDED = {key for key in RING_FORWARDED if key[0] >= term}
+                RING_FORWARDED.add((term, forward_id))
+
+    if resend_coordinator:
+        logger.info(f"Token de P{candidate_id} obsoleto. Reenviando COORDINATOR (P{leader_id}, term {leader_term}).")
+        await send_coordinator_to_peer(candidate_id, leader_id, leader_term)
+        return
+
+    if watch:
+        create_background_task(watch_election(term, ELECTION_TIMEOUT * 2))
+    if forward_id is None:
+        await become_leader(term)
+    elif not await send_ring_election(forward_id, term):
+        await become_leader(term)
+
+
+async def watch_election(term: int, timeout: float):
+    """Reinicia a eleição se nenhum COORDINATOR chegar para o `term` dentro de `timeout`."""
+    await asyncio.sleep(timeout)
+    with STATE_LOCK:
+        undecided = LEADER_TERM < term and ELECTION_TERM == term
+    if undecided:
+        logger.warning(f"Nenhum COORDINATOR no term {term}. Reiniciando eleição.")
+        schedule_election(term + 1)
+
+
+async def handle_answer_message(peer_id: int, term: int = 0):
     """Recebe uma mensagem de ANSWER durante uma eleição."""
     global ELECTION_ANSWERS_RECEIVED, HIGHEST_PRIORITY_ID
     
     with STATE_LOCK:
+        if term < CANDIDATE_TERM:
+            logger.info(f"ANSWER de P{peer_id} para o term {term} (antigo). Ignorando.")
+            return
         if peer_id not in ELECTION_ANSWERS_RECEIVED:
             ELECTION_ANSWERS_RECEIVED.append(peer_id)
             if peer_id > HIGHEST_PRIORITY_ID:
                 HIGHEST_PRIORITY_ID = peer_id
             logger.info(f"ANSWER recebido de P{peer_id}. Total de respostas: {len(ELECTION_ANSWERS_RECEIVED)}")
+        if ANSWER_EVENT is not None:
+            ANSWER_EVENT.set()
 
 
-async def handle_coordinator_message(leader_id: int):
+async def handle_coordinator_message(leader_id: int, term: int = 0):
     """Recebe notificação de um novo líder."""
-    global CURRENT_LEADER, LEADER_STATE, ELECTION_IN_PROGRESS
+    global CURRENT_LEADER, LEADER_STATE, ELECTION_IN_PROGRESS, LEADER_TERM, ELECTION_TERM, LEADER_SINCE
     
     with STATE_LOCK:
+        # Ignora anúncios de terms já superados, exceto de um líder mais forte que o atual: no
+        # Bully o maior ID vence, mesmo que tenha reiniciado e perdido o term corrente.
+        if CURRENT_LEADER is not None and leader_id <= CURRENT_LEADER and (
+            term < LEADER_TERM or (term == LEADER_TERM and leader_id < CURRENT_LEADER)
+        ):
+            logger.warning(f"COORDINATOR obsoleto (P{leader_id}, term {term}). Ignorando.")
+            return
         CURRENT_LEADER = leader_id
-        LEADER_STATE = "FOLLOWER"
+        LEADER_TERM = max(LEADER_TERM, term)
+        LEADER_SINCE = time.time()
+        ELECTION_TERM = max(ELECTION_TERM, term)
+        LEADER_STATE = "LEADER" if leader_id == PROCESS_ID else "FOLLOWER"
+        ELECTION_IN_PROGRESS = False
+        if COORDINATOR_EVENT is not None:
+            COORDINATOR_EVENT.set()
+        if ANSWER_EVENT is not None:
+            ANSWER_EVENT.set()  # Encerra a espera por ANSWER de uma candidatura já decidida
+        logger.success(f">>> NOVO LÍDER ELEITO <<< P{leader_id} é o novo LÍDER (notificado para P{PROCESS_ID}, term {term}).")
+
+
+async def become_leader(term: int):
+    """Assume a liderança no `term` e notifica todos os processos."""
+    global LEADER_STATE, CURRENT_LEADER, ELECTION_IN_PROGRESS, LEADER_TERM, LEADER_SINCE
+    with STATE_LOCK:
+        if LEADER_TERM >= term:
+            return
+        logger.success(f">>> NOVO LÍDER ELEITO <<< P{PROCESS_ID} é o novo LÍDER! (term {term})")
+        LEADER_STATE = "LEADER"
+        CURRENT_LEADER = PROCESS_ID
+        LEADER_TERM = term
+        LEADER_SINCE = time.time()
         ELECTION_IN_PROGRESS = False
-        logger.success(f">>> NOVO LÍDER ELEITO <<< P{leader_id} é o novo LÍDER (notificado para P{PROCESS_ID}).")
+    await broadcast_coordinator(PROCESS_ID, term)
 
 
-async def broadcast_coordinator(leader_id: int):
+async def broadcast_coordinator(leader_id: int, term: int = 0):
     """Envia COORDINATOR para todos os processos."""
     from src.communication import send_coordinator_to_all_peers
     logger.info(f"P{PROCESS_ID} (líder) notificando todos sobre sua eleição...")
-    await send_coordinator_to_all_peers(leader_id)
-
+    await send_coordinator_to_all_peers(leader_id, term)
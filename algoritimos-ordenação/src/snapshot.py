@@ -0,0 +1,301 @@
+# src/snapshot.py
+import asyncio
+import json
+import os
+from typing import Dict, List, Any, Optional
+from src import process_logic
+from src.models import LocalSnapshot
+from src.logger import logger
+from src.config import TOTAL_PROCESSES, PROCESS_ID, SNAPSHOT_DIR, SNAPSHOT_TIMEOUT
+
+# --- Snapshot Global Consistente (Chandy–Lamport) ---
+#
+# Os canais HTTP entre os processos não são FIFO (cada envio é uma requisição independente),
+# então o marcador sozinho não separa as mensagens "antes" e "depois" do snapshot. Cada mensagem
+# entre processos carrega a época de snapshot do remetente (`snapshot_epoch`) e o marcador informa
+# quantas mensagens da época anterior foram enviadas no canal (variante de Lai-Yang/Mattern):
+# - mensagem com época maior que a local: registra o estado ANTES de processá-la;
+# - mensagem com a época anterior recebida após o registro: está em trânsito e entra no canal;
+# - o canal fecha quando o marcador chegou e todas as mensagens anunciadas foram recebidas.
+
+# Época do último snapshot registrado localmente (0 = nenhum)
+SNAPSHOT_EPOCH = 0
+
+# Mensagens enviadas por destino e recebidas por origem na época atual
+MESSAGES_SENT: Dict[int, int] = {}
+MESSAGES_RECEIVED: Dict[int, int] = {}
+# Mensagens da época anterior anunciadas nos marcadores, por destino (lidas no envio de cada marcador)
+PREVIOUS_SENT: Dict[int, int] = {}
+
+# --- Estado do snapshot em andamento ---
+SNAPSHOT_IN_PROGRESS = False
+SNAPSHOT_INITIATOR: Optional[int] = None
+# Mensagens da época anterior recebidas por origem (antes e depois do registro)
+PREVIOUS_RECEIVED: Dict[int, int] = {}
+# Quantidade de mensagens da época anterior anunciada pelo marcador de cada origem
+MARKER_COUNTS: Dict[int, int] = {}
+LOCAL_STATE: Dict[str, Any] = {}
+CHANNEL_STATE: Dict[int, List[Dict[str, Any]]] = {}
+
+# --- Estado do iniciador ---
+# Snapshots locais recebidos (snapshot_id -> process_id -> snapshot) e snapshots consolidados
+SNAPSHOT_REPORTS: Dict[int, Dict[int, LocalSnapshot]] = {}
+MERGED_SNAPSHOTS: Dict[int, Dict[str, Any]] = {}
+
+
+def peer_ids() -> List[int]:
+    """IDs de todos os outros processos (origens dos canais de entrada)."""
+    return [i for i in range(TOTAL_PROCESSES) if i != PROCESS_ID]
+
+
+def tag_outgoing_message(peer_id: int, count: int = 1) -> int:
+    """Contabiliza `count` mensagens enviadas para `peer_id` e retorna a época a anexar a elas."""
+    MESSAGES_SENT[peer_id] = MESSAGES_SENT.get(peer_id, 0) + count
+    return SNAPSHOT_EPOCH
+
+
+def untag_outgoing_message(peer_id: int, snapshot_epoch: int, count: int = 1):
+    """Desfaz a contagem de `count` mensagens marcadas com `snapshot_epoch` que não chegaram a `peer_id`."""
+    if snapshot_epoch == SNAPSHOT_EPOCH:
+        MESSAGES_SENT[peer_id] = MESSAGES_SENT.get(peer_id, 0) - count
+    elif snapshot_epoch == SNAPSHOT_EPOCH - 1:
+        # Só tem efeito se o marcador para `peer_id` ainda não saiu; senão o canal fecha pelo timeout
+        PREVIOUS_SENT[peer_id] = PREVIOUS_SENT.get(peer_id, 0) - count
+
+
+def capture_process_state() -> Dict[str, Any]:
+    """Copia o estado dos algoritmos (Q1, Q2 e Q3) deste processo."""
+    pl = process_logic
+    with pl.STATE_LOCK:
+        return {
+            "clock": pl.LOGICAL_CLOCK,
+            "q1": {
+                "pending_queue": [
+                    {"ts": ts, "sender_id": sender_id, "message_id": message.message_id}
+                    for ts, sender_id, message in sorted(pl.PENDING_QUEUE, key=lambda e: (e[0], e[1]))
+                ],
+                "ack_table": dict(pl.ACK_TABLE),
+            },
+            "q2": {
+                "in_use": pl.RESOURCE_IN_USE,
+                "waiting": pl.WAITING_FOR_RESOURCE,
+                "request_ts": pl.REQUEST_TIMESTAMP,
+                "pending_replies": pl.PENDING_REPLIES_COUNT,
+                "deferred_replies": list(pl.DEFERRED_REPLIES),
+            },
+            "q3": {
+                "state": pl.LEADER_STATE,
+                "leader": pl.CURRENT_LEADER,
+                "term": pl.ELECTION_TERM,
+                "leader_term": pl.LEADER_TERM,
+                "election_in_progress": pl.ELECTION_IN_PROGRESS,
+                "answers": list(pl.ELECTION_ANSWERS_RECEIVED),
+            },
+        }
+
+
+def record_local_state(snapshot_id: int, initiator_id: Optional[int] = None):
+    """Registra o estado local, inicia a gravação dos canais e envia os marcadores."""
+    from src.main import create_background_task
+    from src.communication import send_markers_to_peers
+    global SNAPSHOT_EPOCH, SNAPSHOT_IN_PROGRESS, SNAPSHOT_INITIATOR
+    global MESSAGES_SENT, MESSAGES_RECEIVED, PREVIOUS_SENT, PREVIOUS_RECEIVED, LOCAL_STATE
+
+    LOCAL_STATE = capture_process_state()
+    PREVIOUS_SENT = MESSAGES_SENT
+
+    # Mensagens marcadas com a época anterior passam a ser pré-snapshot
+    SNAPSHOT_EPOCH = snapshot_id
+    SNAPSHOT_IN_PROGRESS = True
+    SNAPSHOT_INITIATOR = initiator_id
+    PREVIOUS_RECEIVED = MESSAGES_RECEIVED
+    MESSAGES_RECEIVED = {}
+    MESSAGES_SENT = {}
+    MARKER_COUNTS.clear()
+    CHANNEL_STATE.clear()
+    logger.info(f"SNAPSHOT {snapshot_id}: estado local registrado (clock={LOCAL_STATE['clock']}).")
+
+    create_background_task(send_markers_to_peers(snapshot_id, initiator_id, PREVIOUS_SENT))
+    create_background_task(snapshot_watchdog(snapshot_id))
+    check_snapshot_completion()
+
+
+def start_snapshot() -> Optional[int]:
+    """Inicia um novo snapshot global. Retorna o ID do snapshot ou None se já houver um em andamento."""
+    if SNAPSHOT_IN_PROGRESS:
+        logger.warning(f"Snapshot {SNAPSHOT_EPOCH} ainda em andamento. Pedido ignorado.")
+        return None
+
+    snapshot_id = SNAPSHOT_EPOCH + 1
+    SNAPSHOT_REPORTS[snapshot_id] = {}
+    logger.info(f">>> INICIANDO SNAPSHOT {snapshot_id} <<<")
+    record_local_state(snapshot_id, initiator_id=PROCESS_ID)
+    return snapshot_id
+
+
+def record_incoming_message(sender_id: int, snapshot_epoch: int, kind: str, payload: Dict[str, Any]):
+    """Contabiliza uma mensagem recebida de outro processo ANTES de ela alterar o estado local."""
+    if snapshot_epoch > SNAPSHOT_EPOCH:
+        # O remetente já registrou seu estado: registra o nosso antes de processar a mensagem
+        record_local_state(snapshot_epoch)
+
+    if snapshot_epoch == SNAPSHOT_EPOCH:
+        MESSAGES_RECEIVED[sender_id] = MESSAGES_RECEIVED.get(sender_id, 0) + 1
+    elif snapshot_epoch == SNAPSHOT_EPOCH - 1:
+        PREVIOUS_RECEIVED[sender_id] = PREVIOUS_RECEIVED.get(sender_id, 0) + 1
+        if SNAPSHOT_IN_PROGRESS:
+            # Enviada antes do snapshot do remetente e recebida depois do nosso: estava em trânsito
+            CHANNEL_STATE.setdefault(sender_id, []).append({"kind": kind, **payload})
+            check_snapshot_completion()
+    else:
+        logger.warning(f"Mensagem '{kind}' de P{sender_id} com época de snapshot {snapshot_epoch} antiga.")
+
+
+def handle_marker(snapshot_id: int, sender_id: int, initiator_id: Optional[int], sent_count: int):
+    """Processa o marcador recebido no canal vindo de `sender_id`."""
+    if snapshot_id < SNAPSHOT_EPOCH or (snapshot_id == SNAPSHOT_EPOCH and not SNAPSHOT_IN_PROGRESS):
+        logger.warning(f"Marcador do snapshot {snapshot_id} de P{sender_id} chegou atrasado. Ignorando.")
+        return
+
+    if snapshot_id > SNAPSHOT_EPOCH:
+        record_local_state(snapshot_id, initiator_id)
+
+    adopt_initiator(initiator_id)
+    MARKER_COUNTS[sender_id] = sent_count
+    logger.info(f"SNAPSHOT {snapshot_id}: marcador de P{sender_id} ({sent_count} mensagens anunciadas).")
+    check_snapshot_completion()
+
+
+def adopt_initiator(initiator_id: Optional[int]):
+    """Define o iniciador do snapshot atual. Com iniciadores simultâneos (mesmo ID de snapshot), vence o menor."""
+    from src.main import create_background_task
+    from src.communication import send_snapshot_report
+    global SNAPSHOT_INITIATOR
+
+    if initiator_id is None or (SNAPSHOT_INITIATOR is not None and SNAPSHOT_INITIATOR <= initiator_id):
+        return
+    previous = SNAPSHOT_INITIATOR
+    SNAPSHOT_INITIATOR = initiator_id
+
+    if previous == PROCESS_ID:
+        # Este processo perdeu a iniciativa: os snapshots locais já recebidos vão para o vencedor
+        reports = SNAPSHOT_REPORTS.pop(SNAPSHOT_EPOCH, {})
+        logger.warning(f"SNAPSHOT {SNAPSHOT_EPOCH}: também iniciado por P{initiator_id}, que fará a consolidação.")
+        for report in reports.values():
+            create_background_task(send_snapshot_report(initiator_id, report))
+
+
+def open_channels() -> List[int]:
+    """Canais de entrada cujo marcador ou mensagens em trânsito ainda não chegaram."""
+    return [
+        peer_id for peer_id in peer_ids()
+        if peer_id not in MARKER_COUNTS or PREVIOUS_RECEIVED.get(peer_id, 0) < MARKER_COUNTS[peer_id]
+    ]
+
+
+def check_snapshot_completion():
+    """Finaliza o snapshot local quando todos os canais de entrada estiverem fechados."""
+    if SNAPSHOT_IN_PROGRESS and SNAPSHOT_INITIATOR is not None and not open_channels():
+        finish_local_snapshot()
+
+
+def finish_local_snapshot():
+    """Encerra a gravação dos canais e envia o snapshot local ao iniciador."""
+    from src.main import create_background_task
+    from src.communication import send_snapshot_report
+    global SNAPSHOT_IN_PROGRESS
+
+    SNAPSHOT_IN_PROGRESS = False
+    report = LocalSnapshot(
+        snapshot_id=SNAPSHOT_EPOCH,
+        process_id=PROCESS_ID,
+        state=LOCAL_STATE,
+        channels={peer_id: list(messages) for peer_id, messages in CHANNEL_STATE.items() if messages},
+        incomplete_channels=open_channels(),
+    )
+    logger.success(
+        f"SNAPSHOT {SNAPSHOT_EPOCH}: snapshot local concluído "
+        f"({sum(len(m) for m in report.channels.values())} mensagens em trânsito)."
+    )
+
+    if SNAPSHOT_INITIATOR == PROCESS_ID:
+        receive_snapshot_report(report)
+    elif SNAPSHOT_INITIATOR is not None:
+        create_background_task(send_snapshot_report(SNAPSHOT_INITIATOR, report))
+
+
+async def snapshot_watchdog(snapshot_id: int):
+    """Fecha o snapshot por timeout quando algum canal não termina (ex: par fora do ar)."""
+    await asyncio.sleep(SNAPSHOT_TIMEOUT)
+    if SNAPSHOT_IN_PROGRESS and SNAPSHOT_EPOCH == snapshot_id:
+        logger.warning(f"SNAPSHOT {snapshot_id}: timeout. Canais incompletos: {open_channels()}.")
+        finish_local_snapshot()
+
+    if SNAPSHOT_INITIATOR == PROCESS_ID and snapshot_id not in MERGED_SNAPSHOTS:
+        # Dá aos demais processos o mesmo prazo para enviarem seus snapshots locais
+        await asyncio.sleep(SNAPSHOT_TIMEOUT)
+        if snapshot_id not in MERGED_SNAPSHOTS:
+            merge_snapshot(snapshot_id)
+
+
+# --- Consolidação (apenas no iniciador) ---
+
+def receive_snapshot_report(report: LocalSnapshot):
+    """Armazena o snapshot local de um processo e consolida quando todos tiverem chegado."""
+    from src.main import create_background_task
+    from src.communication import send_snapshot_report
+
+    if report.snapshot_id == SNAPSHOT_EPOCH and SNAPSHOT_INITIATOR not in (None, PROCESS_ID):
+        # Enviado a este processo antes de o remetente saber do iniciador vencedor
+        create_background_task(send_snapshot_report(SNAPSHOT_INITIATOR, report))
+        return
+
+    reports = SNAPSHOT_REPORTS.get(report.snapshot_id)
+    if reports is None:
+        logger.warning(f"Snapshot local de P{report.process_id} para snapshot {report.snapshot_id} inesperado.")
+        return
+
+    reports[report.process_id] = report
+    logger.info(f"SNAPSHOT {report.snapshot_id}: recebido snapshot local de P{report.process_id} "
+                f"({len(reports)}/{TOTAL_PROCESSES}).")
+    if report.snapshot_id in MERGED_SNAPSHOTS:
+        # Chegou depois do prazo do iniciador (o watchdog do participante começa quando ele registra
+        # o estado): atualiza o snapshot consolidado em vez de descartar o relatório
+        logger.warning(f"SNAPSHOT {report.snapshot_id}: snapshot local de P{report.process_id} atrasado. Reconsolidando.")
+        merge_snapshot(report.snapshot_id)
+    elif len(reports) == TOTAL_PROCESSES:
+        merge_snapshot(report.snapshot_id)
+
+
+def merge_snapshot(snapshot_id: int) -> Dict[str, Any]:
+    """Consolida os snapshots locais e grava o arquivo compacto `snapshot-{id}.json`.
+
+    Os relatórios continuam em SNAPSHOT_REPORTS para que um relatório atrasado reconsolide o snapshot.
+    """
+    reports = SNAPSHOT_REPORTS.get(snapshot_id, {})
+    merged = {
+        "snapshot_id": snapshot_id,
+        "initiator": PROCESS_ID,
+        "processes": {
+            pid: {"state": r.state, "channels": r.channels}
+            for pid, r in sorted(reports.items())
+        },
+        "incomplete_channels": sorted(
+            f"P{src}->P{pid}" for pid, r in reports.items() for src in r.incomplete_channels
+        ),
+        "missing_processes": [pid for pid in range(TOTAL_PROCESSES) if pid not in reports],
+    }
+    MERGED_SNAPSHOTS[snapshot_id] = merged
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"snapshot-{snapshot_id}.json")
+    with open(path, "w") as f:
+        json.dump(merged, f, separators=(",", ":"))
+
+    logger.success(f">>> SNAPSHOT {snapshot_id} CONSOLIDADO <<< Gravado em {path}.")
+    return merged
+
+
+def get_snapshot(snapshot_id: int) -> Optional[Dict[str, Any]]:
+    """Retorna o snapshot consolidado (disponível apenas no iniciador)."""
+    return MERGED_SNAPSHOTS.get(snapshot_id)
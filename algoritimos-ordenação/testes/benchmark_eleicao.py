@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Benchmark de eleição de líder (Q3): tempo até o líder e número de mensagens.
+#
+# Para cada rodada, dispara /start-election ao mesmo tempo nos K processos de menor ID
+# (pior caso para o Bully), mede o tempo até que todos os processos concordem sobre o
+# líder de um term novo e soma as mensagens de eleição enviadas (GET /election-stats).
+#
+# Uso (com os port-forwards ativos, ver benchmark_eleicao.sh):
+#   python benchmark_eleicao.py --endpoints http://127.0.0.1:8080 http://127.0.0.1:8081 \
+#       http://127.0.0.1:8082 --concurrent 1 3 --rounds 5
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def fetch_stats(client, endpoints):
+    responses = await asyncio.gather(*(client.get(f"{url}/election-stats") for url in endpoints))
+    return [r.json() for r in responses]
+
+
+def total_messages(stats):
+    return sum(sum(s["messages_sent"].values()) for s in stats)
+
+
+async def run_round(client, endpoints, concurrent, timeout, settle):
+    """Executa uma rodada e retorna (tempo até o líder em s, mensagens enviadas)."""
+    before = await fetch_stats(client, endpoints)
+    base_term = max(s["term"] for s in before)
+    base_messages = total_messages(before)
+
+    # Os processos de menor ID são os que mais disparam mensagens no Bully
+    triggered = sorted(range(len(endpoints)), key=lambda i: before[i]["process_id"])[:concurrent]
+    start = time.monotonic()
+    await asyncio.gather(*(client.post(f"{endpoints[i]}/start-election") for i in triggered))
+
+    elapsed = None
+    while time.monotonic() - start < timeout:
+        stats = await fetch_stats(client, endpoints)
+        leaders = {(s["leader_id"], s["leader_term"]) for s in stats}
+        if len(leaders) == 1:
+            leader_id, leader_term = leaders.pop()
+            if leader_id is not None and leader_term > base_term:
+                elapsed = time.monotonic() - start
+                break
+        await asyncio.sleep(0.01)
+
+    # Candidaturas atrasadas ainda podem enviar mensagens depois da convergência
+    await asyncio.sleep(settle)
+    after = await fetch_stats(client, endpoints)
+    return elapsed, total_messages(after) - base_messages
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark de eleição de líder (Q3).")
+    parser.add_argument("--endpoints", nargs="+", required=True, help="URLs dos processos")
+    parser.add_argument("--concurrent", nargs="+", type=int, default=[1], help="Gatilhos simultâneos por rodada")
+    parser.add_argument("--rounds", type=int, default=5, help="Rodadas por configuração")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Tempo máximo por rodada (s)")
+    parser.add_argument("--settle", type=float, default=1.0, help="Espera após a convergência (s)")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        stats = await fetch_stats(client, args.endpoints)
+        mode = stats[0]["mode"]
+        n = len(args.endpoints)
+
+        print(f"| modo | N | gatilhos | rodadas | tempo médio (ms) | tempo máx (ms) | mensagens (média) |")
+        print(f"|------|---|----------|---------|------------------|----------------|-------------------|")
+        for concurrent in args.concurrent:
+            concurrent = min(concurrent, n)
+            times, messages, failures = [], [], 0
+            for _ in range(args.rounds):
+                elapsed, sent = await run_round(client, args.endpoints, concurrent, args.timeout, args.settle)
+                if elapsed is None:
+                    failures += 1
+                else:
+                    times.append(elapsed * 1000)
+                messages.append(sent)
+
+            mean_time = f"{statistics.mean(times):.0f}" if times else "-"
+            max_time = f"{max(times):.0f}" if times else "-"
+            rounds = f"{args.rounds - failures}/{args.rounds}"
+            print(f"| {mode} | {n} | {concurrent} | {rounds} | {mean_time} | {max_time} | {statistics.mean(messages):.1f} |")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+#!/bin/bash
+
+# Script de benchmark para Q3 - Tempo até o líder e número de mensagens de eleição
+# Para cada modo (bully/ring) e cada tamanho de cluster N, reconfigura o StatefulSet,
+# abre port-forwards para todos os pods e executa benchmark_eleicao.py com
+# 1 gatilho e com N gatilhos simultâneos.
+
+NS=${NS:-"3 5 7"}
+MODES=${MODES:-"bully ring"}
+ROUNDS=${ROUNDS:-5}
+
+echo "=========================================="
+echo "  BENCHMARK Q3 - ELEIÇÃO DE LÍDER"
+echo "=========================================="
+
+SCRIPT_DIR=$(cd "$(dirname "$0")" && pwd)
+PF_PIDS=""
+
+cleanup() {
+    kill $PF_PIDS 2>/dev/null
+    PF_PIDS=""
+}
+trap "echo 'Encerrando port-forwards...'; cleanup; exit" INT TERM
+
+for MODE in $MODES; do
+    for N in $NS; do
+        echo ""
+        echo "--- Modo: $MODE | N = $N ---"
+
+        # Reconfigura e escala o StatefulSet (os pods são recriados com o novo ambiente)
+        kubectl set env statefulset/algoritmos-coord TOTAL_PROCESSES="$N" ELECTION_MODE="$MODE" > /dev/null
+        kubectl scale statefulset algoritmos-coord --replicas="$N" > /dev/null
+        kubectl rollout status statefulset/algoritmos-coord --timeout=180s > /dev/null
+
+        # Process i -> porta 808i (9000+i a partir de 10 processos)
+        ENDPOINTS=""
+        for i in $(seq 0 $((N - 1))); do
+            PORT=$((i < 10 ? 8080 + i : 9000 + i))
+            kubectl port-forward "pods/algoritmos-coord-$i" "$PORT:8080" > /dev/null 2>&1 &
+            PF_PIDS="$PF_PIDS $!"
+            ENDPOINTS="$ENDPOINTS http://127.0.0.1:$PORT"
+        done
+
+        # Aguardar que as port-forwards sejam estabelecidas
+        sleep 3
+
+        python3 "$SCRIPT_DIR/benchmark_eleicao.py" --endpoints $ENDPOINTS --concurrent 1 "$N" --rounds "$ROUNDS"
+
+        cleanup
+    done
+done
+
+# Restaura a configuração padrão (3 processos, Bully)
+echo ""
+echo "Restaurando configuração padrão..."
+kubectl set env statefulset/algoritmos-coord TOTAL_PROCESSES=3 ELECTION_MODE=bully > /dev/null
+kubectl scale statefulset algoritmos-coord --replicas=3 > /dev/null
+
+echo "Benchmark concluído."
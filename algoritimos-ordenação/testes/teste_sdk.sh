@@ -0,0 +1,95 @@
+#!/bin/bash
+
+# Script para testar o SDK assíncrono (client/sdk.py) e os endpoints usados por ele:
+# /send-batch, /wait-delivery, /request-resource e /resource-status.
+# Verifica se os futuros de entrega (Q1) e de concessão do recurso (Q2) são resolvidos.
+
+MENSAGENS=${MENSAGENS:-30}
+
+echo "Iniciando teste do SDK assíncrono..."
+echo "-------------------------------------------------"
+
+SCRIPT_DIR=$(cd "$(dirname "$0")" && pwd)
+
+# Inicia os port-forwards em background
+echo "Iniciando port-forwards para os Pods 0, 1 e 2 (localhost:8080-8082)..."
+kubectl port-forward algoritmos-coord-0 8080:8080 > /dev/null 2>&1 &
+PID1=$!
+kubectl port-forward algoritmos-coord-1 8081:8080 > /dev/null 2>&1 &
+PID2=$!
+kubectl port-forward algoritmos-coord-2 8082:8080 > /dev/null 2>&1 &
+PID3=$!
+
+# Garante que os processos de port-forward sejam encerrados ao final do script
+trap "echo 'Encerrando port-forwards...'; kill $PID1 $PID2 $PID3 2>/dev/null; exit" INT TERM
+
+echo "Aguardando 3 segundos para os port-forwards estabilizarem..."
+sleep 3
+
+echo ""
+echo "1) Endpoints usados pelo SDK (curl):"
+echo "   /send-batch:"
+IDS=$(curl -s -X POST http://127.0.0.1:8080/send-batch -H "Content-Type: application/json" \
+    -d '{"contents": ["lote curl 1", "lote curl 2"]}')
+echo "   $IDS"
+echo "   /wait-delivery:"
+MESSAGE_IDS=$(echo "$IDS" | python3 -c 'import json,sys; print(json.dumps(json.load(sys.stdin)["message_ids"]))')
+echo "   $(curl -s -X POST "http://127.0.0.1:8080/wait-delivery?timeout=10" -H "Content-Type: application/json" \
+    -d "{\"message_ids\": $MESSAGE_IDS}")"
+echo "   /request-resource + /resource-status:"
+REQUEST_ID=$(curl -s -X POST http://127.0.0.1:8081/request-resource | \
+    python3 -c 'import json,sys; print(json.load(sys.stdin)["request_id"])')
+echo "   $(curl -s "http://127.0.0.1:8081/resource-status/$REQUEST_ID?timeout=15")"
+
+echo ""
+echo "2) SDK: $MENSAGENS mensagens em lotes e 2 pedidos de recurso concorrentes..."
+cd "$SCRIPT_DIR/.." && PYTHONPATH=. python3 - "$MENSAGENS" <<'EOF'
+import asyncio
+import sys
+import time
+
+from client import ClusterClient, DeliveryReceipt, GrantReceipt
+
+async def main(total: int) -> bool:
+    endpoints = ["http://127.0.0.1:8080", "http://127.0.0.1:8081", "http://127.0.0.1:8082"]
+    async with ClusterClient(endpoints, delivery_timeout=30) as client:
+        start = time.monotonic()
+        sends = [client.send(f"mensagem sdk {i}") for i in range(total)]
+        grants = [client.request_resource(), client.request_resource()]
+        results = await asyncio.gather(*sends, *grants, return_exceptions=True)
+        elapsed = time.monotonic() - start
+
+    deliveries, grant_results = results[:total], results[total:]
+    delivered = sum(isinstance(r, DeliveryReceipt) for r in deliveries)
+    granted = sum(isinstance(r, GrantReceipt) for r in grant_results)
+    print(f"   Entregas confirmadas: {delivered}/{total}")
+    print(f"   Acessos concedidos:   {granted}/{len(grant_results)}")
+    print(f"   Tempo total: {elapsed:.2f}s")
+    for r in results:
+        if isinstance(r, Exception):
+            print(f"   Erro: {type(r).__name__}: {r}")
+    return delivered == total and granted == len(grant_results)
+
+sys.exit(0 if asyncio.run(main(int(sys.argv[1]))) else 1)
+EOF
+RESULTADO=$?
+
+echo ""
+echo "================================================="
+if [ $RESULTADO -eq 0 ]; then
+    echo "✓ Todos os futuros foram resolvidos."
+else
+    echo "✗ Algum futuro falhou ou não foi resolvido."
+fi
+echo "================================================="
+
+echo "Limpando port-forwards..."
+kill $PID1 $PID2 $PID3 2>/dev/null
+# Limpar os pods (criar novos para testes futuros)
+echo "Reiniciando pods..."
+kubectl delete pod algoritmos-coord-0 > /dev/null 2>&1
+kubectl delete pod algoritmos-coord-1 > /dev/null 2>&1
+kubectl delete pod algoritmos-coord-2 > /dev/null 2>&1
+
+echo "Teste concluído."
+exit $RESULTADO
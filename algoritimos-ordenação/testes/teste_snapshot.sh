@@ -0,0 +1,99 @@
+#!/bin/bash
+
+# Script para testar o Snapshot Global Consistente (Chandy–Lamport) com tráfego contínuo.
+# Verifica se logs/snapshot-{id}.json é gravado no iniciador sem canais incompletos.
+
+echo "Iniciando teste do Snapshot Global..."
+echo "-------------------------------------------------"
+
+# Inicia os port-forwards em background
+echo "Iniciando port-forwards para os Pods 0, 1 e 2 (localhost:8080-8082)..."
+kubectl port-forward algoritmos-coord-0 8080:8080 > /dev/null 2>&1 &
+PID1=$!
+kubectl port-forward algoritmos-coord-1 8081:8080 > /dev/null 2>&1 &
+PID2=$!
+kubectl port-forward algoritmos-coord-2 8082:8080 > /dev/null 2>&1 &
+PID3=$!
+
+# Garante que os processos de port-forward e o gerador de tráfego sejam encerrados ao final do script
+trap "echo 'Encerrando port-forwards...'; kill $PID1 $PID2 $PID3 \$TRAFEGO_PID 2>/dev/null; exit" INT TERM
+
+echo "Aguardando 3 segundos para os port-forwards estabilizarem..."
+sleep 3
+
+# Tráfego contínuo de multicast (Q1) em todos os pods enquanto o snapshot é tirado
+echo "Gerando tráfego contínuo de multicast nos 3 pods..."
+(
+    for i in $(seq 1 40); do
+        PORT=$((8080 + i % 3))
+        curl -s -X POST "http://127.0.0.1:$PORT/send?content=Trafego_$i" > /dev/null &
+        sleep 0.2
+    done
+    wait
+) &
+TRAFEGO_PID=$!
+
+sleep 2
+echo ""
+echo "Iniciando snapshot no Pod 0 (com tráfego em andamento)..."
+RESPOSTA=$(curl -s -X POST http://127.0.0.1:8080/snapshot)
+echo "$RESPOSTA"
+SNAPSHOT_ID=$(echo "$RESPOSTA" | python3 -c 'import json,sys; print(json.load(sys.stdin).get("snapshot_id", ""))')
+
+echo ""
+echo "Aguardando o fim do tráfego e a consolidação do snapshot..."
+wait $TRAFEGO_PID
+sleep 5
+
+echo ""
+echo "================================================="
+echo "          SNAPSHOT $SNAPSHOT_ID (Pod 0)            "
+echo "================================================="
+RESULTADO=1
+if [ -n "$SNAPSHOT_ID" ]; then
+    kubectl exec algoritmos-coord-0 -- cat "logs/snapshot-$SNAPSHOT_ID.json" > /tmp/snapshot-$SNAPSHOT_ID.json 2>/dev/null
+    python3 - "/tmp/snapshot-$SNAPSHOT_ID.json" <<'EOF'
+import json
+import sys
+
+try:
+    with open(sys.argv[1]) as f:
+        snapshot = json.load(f)
+except (OSError, ValueError):
+    print("✗ Arquivo do snapshot não encontrado no Pod 0.")
+    sys.exit(1)
+
+for pid, process in snapshot["processes"].items():
+    state = process["state"]
+    in_transit = sum(len(messages) for messages in process["channels"].values())
+    leader = state["q3"]["leader"]
+    print(f"P{pid}: clock={state['clock']} fila={len(state['q1']['pending_queue'])} "
+          f"líder={'P' + str(leader) if leader is not None else '-'} mensagens em trânsito={in_transit}")
+
+print(f"Canais incompletos: {snapshot['incomplete_channels']}")
+print(f"Processos ausentes: {snapshot['missing_processes']}")
+sys.exit(0 if not snapshot["incomplete_channels"] and not snapshot["missing_processes"] else 1)
+EOF
+    RESULTADO=$?
+else
+    echo "✗ O snapshot não foi iniciado."
+fi
+
+echo "================================================="
+if [ $RESULTADO -eq 0 ]; then
+    echo "✓ Snapshot consistente gravado sem canais incompletos."
+else
+    echo "✗ Snapshot ausente ou incompleto."
+fi
+echo "================================================="
+
+echo "Limpando port-forwards..."
+kill $PID1 $PID2 $PID3 2>/dev/null
+# Limpar os pods (criar novos para testes futuros)
+echo "Reiniciando pods..."
+kubectl delete pod algoritmos-coord-0 > /dev/null 2>&1
+kubectl delete pod algoritmos-coord-1 > /dev/null 2>&1
+kubectl delete pod algoritmos-coord-2 > /dev/null 2>&1
+
+echo "Teste concluído."
+exit $RESULTADO